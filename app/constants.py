@@ -7,6 +7,24 @@ ASSETS_DIR = BASE_DIR / 'assets'
 ICONS_DIR = ASSETS_DIR / 'icons'
 IMAGES_DIR = ASSETS_DIR / 'images'
 DATABASE_PATH = BASE_DIR / 'database.json'
+SQLITE_DATABASE_PATH = BASE_DIR / 'database.sqlite3'
+
+# Storage backend: 'tinydb' (database.json) or 'sqlite' (database.sqlite3, migrated from database.json on first use).
+DATABASE_BACKEND = 'tinydb'
+# With the 'tinydb' backend, the storage format:
+# - 'fast': compact database.json, serialized with orjson when it is installed.
+# - 'json': indented database.json.
+# - 'log': changes appended to database.json.log and compacted into database.json in the background.
+# - 'tables': one file per table in the database directory, split from database.json on first use.
+# - 'msgpack': MessagePack-encoded database.msgpack, converted from database.json on first use (needs msgpack).
+# - 'gzip' / 'zstd': compressed database.json.gz / database.json.zst, compressed from database.json on first use
+#   ('zstd' needs zstandard).
+DATABASE_STORAGE = 'fast'
+# With the 'sqlite' backend, search with the ranked FTS5 full-text index instead of a substring scan.
+SQLITE_FULL_TEXT_SEARCH = True
+# With the 'sqlite' backend, the journal mode. 'DELETE', the default rollback journal, works on network folders;
+# 'WAL' is faster but needs every process on the same computer, as it relies on shared memory.
+SQLITE_JOURNAL_MODE = 'DELETE'
 
 GENDER_OPTIONS = ('Masculino', 'Feminino')
 ETHNICITY_OPTIONS = ('Negra', 'Branca', 'Parda', 'Amarela', 'Indigena')
@@ -16,3 +34,22 @@ SCHOOL_PERIOD_OPTIONS = ('Manhã', 'Tarde', 'Noite')
 HOUSEHOLD_OPTIONS = ('Sem renda', 'Um salário mínimo', 'Dois salários mínimos', 'Três ou mais salários mínimos')
 TYPE_HOUSING = ('Própia', 'Alugada', 'Financiada', 'Cedida')
 MARITAL_STATUS = ('Solteiro(a)', 'Casado(a)', 'Viuvo(a)')
+
+# Write-behind: buffer writes in memory and flush after N writes, T seconds or when idle.
+# It needs DATABASE_LOCK = 'none': a buffered database would overwrite the changes other desks saved meanwhile.
+DATABASE_WRITE_BEHIND = False
+DATABASE_FLUSH_WRITES = 20
+DATABASE_FLUSH_SECONDS = 5.0
+DATABASE_FLUSH_IDLE_SECONDS = 1.0
+
+# Records read in an older record schema are upgraded in memory and saved in the background, N records a second
+# per table, once no record was saved for DATABASE_FLUSH_IDLE_SECONDS.
+SCHEMA_UPGRADE_BATCH_SIZE = 500
+
+# Cross-process locking of the TinyDB database, for desks sharing it on a network folder:
+# - 'auto': fcntl locks where available, shared for reads and exclusive for writes, and a lock file elsewhere.
+# - 'file': a lock file on every system. Use it on every desk when Linux and Windows desks share the database.
+# - 'none': no locking.
+DATABASE_LOCK = 'auto'
+DATABASE_LOCK_TIMEOUT = 30.0
+DATABASE_LOCK_STALE_SECONDS = 120.0
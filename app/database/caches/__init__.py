@@ -0,0 +1 @@
+from .entity_cache import EntityCache  # isort:skip
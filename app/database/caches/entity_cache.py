@@ -0,0 +1,136 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from tinydb import TinyDB
+
+
+class EntityCache:
+    """
+    Class to keep the hydrated entities of a table in memory.
+
+    Entities are keyed by doc_id and kept in doc_id order. Every change bumps `generation`, which is used to know when
+    derived values, like the newest first listing, must be rebuilt. The cache belongs to the TinyDB instance it was
+    loaded from, so opening a new session invalidates it.
+
+    The given indexes are rebuilt on load and patched on every put and discard. An index is any object with `clear`,
+    `add(doc_id, entity)` and `remove(doc_id, entity)` methods.
+    """
+
+    def __init__(self, indexes: Sequence[Any] = ()) -> None:
+        self.indexes = list(indexes)
+        self.entities: Dict[int, Any] = {}
+        self.database: Optional[TinyDB] = None
+        self.generation = 0
+        self.listing: List[Any] = []
+        self.listing_generation = -1
+        self.sorted_doc_ids: List[int] = []
+        self.sorted_doc_ids_generation = -1
+
+    def is_loaded(self, database: TinyDB) -> bool:
+        """
+        Check if the cache holds the entities of the given database.
+
+        :param database: The TinyDB instance being used.
+
+        :return: True if the cache can be used.
+        """
+        return self.database is database
+
+    def load(self, database: TinyDB, entities: Dict[int, Any]) -> None:
+        """
+        Replace the cached entities.
+
+        :param database: The TinyDB instance the entities come from.
+        :param entities: The entities keyed by doc_id, in doc_id order.
+
+        :return: None
+        """
+        self.database = database
+        self.entities = entities
+        self.generation += 1
+
+        for index in self.indexes:
+            index.clear()
+            for doc_id, entity in entities.items():
+                index.add(doc_id, entity)
+
+    def put(self, doc_id: int, entity: Any) -> None:
+        """
+        Add or replace a single entity.
+
+        :param doc_id: The document ID of the entity.
+        :param entity: The hydrated entity.
+
+        :return: None
+        """
+        previous = self.entities.get(doc_id)
+        self.entities[doc_id] = entity
+        self.generation += 1
+
+        for index in self.indexes:
+            if previous is not None:
+                index.remove(doc_id, previous)
+            index.add(doc_id, entity)
+
+    def discard(self, doc_id: int) -> None:
+        """
+        Remove a single entity, if it is cached.
+
+        :param doc_id: The document ID of the entity.
+
+        :return: None
+        """
+        previous = self.entities.pop(doc_id, None)
+        self.generation += 1
+
+        if previous is not None:
+            for index in self.indexes:
+                index.remove(doc_id, previous)
+
+    def invalidate(self) -> None:
+        """
+        Drop every cached entity.
+
+        :return: None
+        """
+        self.database = None
+        self.entities = {}
+        self.generation += 1
+
+        for index in self.indexes:
+            index.clear()
+
+    def get(self, doc_id: int) -> Optional[Any]:
+        """
+        Get a single cached entity.
+
+        :param doc_id: The document ID of the entity.
+
+        :return: The entity, or None if it is not cached.
+        """
+        return self.entities.get(doc_id)
+
+    def newest_first(self) -> List[Any]:
+        """
+        Get the cached entities from the newest to the oldest.
+
+        The list is rebuilt only when the generation changes.
+
+        :return: A list of entities.
+        """
+        if self.listing_generation != self.generation:
+            self.listing = list(self.entities.values())[::-1]
+            self.listing_generation = self.generation
+        return self.listing
+
+    def doc_ids(self) -> List[int]:
+        """
+        Get the document IDs of the cached entities in ascending order.
+
+        The list is rebuilt only when the generation changes.
+
+        :return: A sorted list of document IDs.
+        """
+        if self.sorted_doc_ids_generation != self.generation:
+            self.sorted_doc_ids = sorted(self.entities)
+            self.sorted_doc_ids_generation = self.generation
+        return self.sorted_doc_ids
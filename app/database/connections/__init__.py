@@ -1 +1,2 @@
 from .local_connection import LocalConnection  # isort:skip
+from .sqlite_connection import SqliteConnection  # isort:skip
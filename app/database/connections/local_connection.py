@@ -1,20 +1,234 @@
-from typing import Optional
+from contextlib import ExitStack
+from typing import Any, Dict, Optional, Type, Union
 
-from tinydb import TinyDB
+from tinydb import JSONStorage, Storage, TinyDB
 
 from app import constants
+from app.database.locks import LockStatistics
+from app.database.middlewares import LockingMiddleware, ReadCacheMiddleware, WriteBehindMiddleware
+from app.database.storages import CompressedStorage, FastJSONStorage, LogStorage, MessagePackStorage, TableFilesStorage
+from app.database.storages.database_files import check_database_files
+from app.database.storages.log_table import LogTable
+
+# Storage classes selectable with `constants.DATABASE_STORAGE`, and the arguments they are created with.
+STORAGES: Dict[str, Type[Storage]] = {
+    'json': JSONStorage,
+    'fast': FastJSONStorage,
+    'log': LogStorage,
+    'tables': TableFilesStorage,
+    'msgpack': MessagePackStorage,
+    'gzip': CompressedStorage,
+    'zstd': CompressedStorage,
+}
+STORAGE_OPTIONS: Dict[str, Dict[str, Any]] = {
+    'json': {'indent': 2},
+    'fast': {'pretty': False},
+    'log': {'indent': 2},
+    'tables': {'indent': 2},
+    'gzip': {'codec': 'gzip'},
+    'zstd': {'codec': 'zstd'},
+}
 
 
 class LocalConnection:
-    """Class to represent a local connection."""
+    """
+    Class to represent a local connection.
+
+    While a session is open (see `LocalConnection.open_session`) every connection hands out the same TinyDB instance,
+    so `database.json` is parsed only once per process. Without a session each connection opens and closes its own
+    database, as before.
+
+    The storage format is chosen with `constants.DATABASE_STORAGE`, see `STORAGES`.
+
+    With `constants.DATABASE_WRITE_BEHIND` the writes are buffered in memory and flushed according to the
+    `constants.DATABASE_FLUSH_*` policy, on `LocalConnection.flush` and when the session is closed. The buffer holds
+    the whole database, so flushing it would overwrite what other processes saved since it was read: write-behind is
+    refused unless `constants.DATABASE_LOCK` is 'none', which means a single process uses the database.
+
+    Unless `constants.DATABASE_LOCK` is 'none', the storage reads and writes hold a lock shared by every process using
+    the database file, see `LockingMiddleware`. A connection opened with `write=True` holds the lock in exclusive mode
+    for its whole block, so reading, changing, encoding and writing the database can not interleave with another
+    process. When another process wrote the database since the session read it, the session is reopened on the next
+    connection, so no change is made on outdated data. `LocalConnection.lock_statistics` tells how long the lock was
+    waited for.
+    """
 
-    def __init__(self) -> None:
+    session: Optional[TinyDB] = None
+
+    def __init__(self, write: bool = False, batch: bool = False) -> None:
+        """
+        Initialize the LocalConnection.
+
+        :param write: Whether the connection changes the database, and must hold the lock in exclusive mode.
+        :param batch: Whether the writes made during the block are kept in memory and written once when it ends
+            without error, see `ReadCacheMiddleware.defer_writes`.
+        """
+        self.write = write
+        self.batch = batch
         self.database: Optional[TinyDB] = None
+        self.owns_database = False
+        self.exit_stack = ExitStack()
 
     def __enter__(self, *args, **kwargs) -> 'LocalConnection':
-        self.database = TinyDB(constants.DATABASE_PATH, indent=2)
+        if LocalConnection.session is not None:
+            locking = LocalConnection.get_locking(LocalConnection.session)
+            if locking is not None and self.write:
+                self.exit_stack.enter_context(locking.lock.exclusive('transaction'))
+            if locking is not None and locking.is_stale():
+                LocalConnection.reopen_session()
+            self.database = LocalConnection.session
+            self.owns_database = False
+        else:
+            self.database = LocalConnection.create_database()
+            self.owns_database = True
+            locking = LocalConnection.get_locking(self.database)
+            if locking is not None and self.write:
+                self.exit_stack.enter_context(locking.lock.exclusive('transaction'))
+
+        if self.batch:
+            self.database.storage.defer_writes()
         return self
 
-    def __exit__(self, *args, **kwargs) -> None:
-        self.database.close()
-        self.database = None
+    def __exit__(self, exc_type, *args, **kwargs) -> None:
+        try:
+            if self.batch:
+                self.database.storage.end_deferred_writes(save=exc_type is None)
+            if self.owns_database:
+                self.database.close()
+        finally:
+            self.exit_stack.close()
+            self.database = None
+            self.owns_database = False
+
+    @staticmethod
+    def create_database() -> TinyDB:
+        """
+        Create a new TinyDB instance for the local database file.
+
+        :return: The TinyDB instance.
+
+        :raises ValueError: If write-behind is enabled together with locking.
+        """
+        if constants.DATABASE_WRITE_BEHIND and constants.DATABASE_LOCK != 'none':
+            raise ValueError(
+                "DATABASE_WRITE_BEHIND needs DATABASE_LOCK = 'none': "
+                'flushing the buffered database would overwrite the changes of the other processes'
+            )
+
+        storage_cls: Union[Type[Storage], LockingMiddleware] = STORAGES[constants.DATABASE_STORAGE]
+        options = STORAGE_OPTIONS.get(constants.DATABASE_STORAGE, {})
+
+        if storage_cls is JSONStorage:
+            # TinyDB's storage would start an empty database.json over a database kept in another format.
+            check_database_files(constants.DATABASE_PATH, 'json', ('json',))
+
+        if storage_cls is LogStorage:
+            # The compaction lock must be of the same kind as the database lock of the other desks.
+            options = {
+                **options,
+                'use_fcntl': constants.DATABASE_LOCK != 'file',
+                'stale_seconds': constants.DATABASE_LOCK_STALE_SECONDS,
+            }
+
+        if constants.DATABASE_LOCK != 'none':
+            storage_cls = LockingMiddleware(
+                storage_cls,
+                use_fcntl=constants.DATABASE_LOCK == 'auto',
+                timeout=constants.DATABASE_LOCK_TIMEOUT,
+                stale_seconds=constants.DATABASE_LOCK_STALE_SECONDS,
+            )
+
+        if constants.DATABASE_WRITE_BEHIND:
+            middleware = WriteBehindMiddleware(
+                storage_cls,
+                flush_writes=constants.DATABASE_FLUSH_WRITES,
+                flush_seconds=constants.DATABASE_FLUSH_SECONDS,
+            )
+        else:
+            middleware = ReadCacheMiddleware(storage_cls)
+
+        database = TinyDB(constants.DATABASE_PATH, storage=middleware, **options)
+        if STORAGES[constants.DATABASE_STORAGE] is LogStorage:
+            # The tables tell the storage which documents each write changed.
+            database.table_class = LogTable
+        return database
+
+    @staticmethod
+    def open_session() -> TinyDB:
+        """
+        Open the process-wide database session, if it is not open yet.
+
+        :return: The shared TinyDB instance.
+        """
+        if LocalConnection.session is None:
+            LocalConnection.session = LocalConnection.create_database()
+        return LocalConnection.session
+
+    @staticmethod
+    def reopen_session() -> None:
+        """
+        Replace the session with a new TinyDB instance, which reads the database again.
+
+        The entity caches belong to the previous instance, so they are reloaded too.
+
+        :return: None
+        """
+        LocalConnection.session.close()
+        LocalConnection.session = LocalConnection.create_database()
+
+    @staticmethod
+    def get_locking(database: TinyDB) -> Optional[LockingMiddleware]:
+        """
+        Get the locking middleware of a TinyDB instance.
+
+        :param database: The TinyDB instance.
+
+        :return: The locking middleware, or None if the database is not locked.
+        """
+        storage = database.storage.storage
+        return storage if isinstance(storage, LockingMiddleware) else None
+
+    @staticmethod
+    def close_session() -> None:
+        """
+        Close the process-wide database session, if it is open.
+
+        :return: None
+        """
+        if LocalConnection.session is not None:
+            LocalConnection.session.close()
+            LocalConnection.session = None
+
+    @staticmethod
+    def flush() -> None:
+        """
+        Force the pending writes of the session to disk.
+
+        :return: None
+        """
+        if LocalConnection.session is not None and isinstance(LocalConnection.session.storage, WriteBehindMiddleware):
+            LocalConnection.session.storage.flush()
+
+    @staticmethod
+    def flush_if_due() -> None:
+        """
+        Flush the pending writes of the session if they are too old or the database is idle.
+
+        :return: None
+        """
+        if LocalConnection.session is not None and isinstance(LocalConnection.session.storage, WriteBehindMiddleware):
+            LocalConnection.session.storage.flush_if_due(constants.DATABASE_FLUSH_IDLE_SECONDS)
+
+    @staticmethod
+    def lock_statistics() -> Dict[str, LockStatistics]:
+        """
+        Get the time the session waited for the database lock and held it.
+
+        :return: A dictionary with the 'shared' and 'exclusive' statistics, empty without a session or a lock.
+        """
+        locking = None if LocalConnection.session is None else LocalConnection.get_locking(LocalConnection.session)
+
+        if locking is None:
+            return {}
+
+        return {'shared': locking.lock.shared_statistics, 'exclusive': locking.lock.exclusive_statistics}
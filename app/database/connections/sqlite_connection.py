@@ -0,0 +1,209 @@
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional
+
+from app import constants
+from app.database.migrations import RECORD_SCHEMAS_TABLE
+
+TABLES = ('adults', 'children')
+
+# Record attributes indexed by the full-text search table of each table, by full-text column.
+FULL_TEXT_ATTRIBUTES = {
+    'adults': {
+        'name': ('adult_name',),
+        'documents': ('adult_cpf', 'adult_rg'),
+        'details': ('adult_address', 'adult_contacts'),
+    },
+    'children': {
+        'name': ('child_name',),
+        'documents': ('child_cpf', 'child_rg'),
+        'details': ('child_school_name', 'parent_address', 'parent_contacts'),
+    },
+}
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    doc_id INTEGER PRIMARY KEY,
+    search_key TEXT NOT NULL,
+    birthdate TEXT,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {table}_birthdate ON {table} (birthdate);
+
+CREATE TABLE IF NOT EXISTS {table}_documents (
+    number TEXT NOT NULL,
+    doc_id INTEGER NOT NULL REFERENCES {table} (doc_id) ON DELETE CASCADE,
+    PRIMARY KEY (number, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS {table}_documents_doc_id ON {table}_documents (doc_id);
+
+CREATE TABLE IF NOT EXISTS {table}_activities (
+    activity TEXT NOT NULL,
+    doc_id INTEGER NOT NULL REFERENCES {table} (doc_id) ON DELETE CASCADE,
+    PRIMARY KEY (activity, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS {table}_activities_doc_id ON {table}_activities (doc_id);
+"""
+
+# Record schema version reached by every record of each table, see `SchemaMigrations`.
+RECORD_SCHEMAS = """
+CREATE TABLE IF NOT EXISTS {table} (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+FULL_TEXT_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5 (
+    name, documents, details, tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+    INSERT INTO {table}_fts (rowid, name, documents, details) VALUES (new.doc_id, {name}, {documents}, {details});
+END;
+
+CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF document ON {table} BEGIN
+    DELETE FROM {table}_fts WHERE rowid = old.doc_id;
+    INSERT INTO {table}_fts (rowid, name, documents, details) VALUES (new.doc_id, {name}, {documents}, {details});
+END;
+
+CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+    DELETE FROM {table}_fts WHERE rowid = old.doc_id;
+END;
+"""
+
+FULL_TEXT_FILL = """
+DELETE FROM {table}_fts;
+INSERT INTO {table}_fts (rowid, name, documents, details)
+    SELECT doc_id, {name}, {documents}, {details} FROM {table} new;
+"""
+
+
+def full_text_expressions(table: str) -> Dict[str, str]:
+    """
+    Build the SQL expressions extracting the full-text columns of a table from its `new.document` JSON.
+
+    :param table: The table name.
+
+    :return: A dictionary with full-text column names as keys and SQL expressions as values.
+    """
+    expressions = {}
+
+    for column, attributes in FULL_TEXT_ATTRIBUTES[table].items():
+        values = (f"coalesce(json_extract(new.document, '$.{attribute}'), '')" for attribute in attributes)
+        expressions[column] = " || ' ' || ".join(values)
+
+    return expressions
+
+
+class SqliteConnection:
+    """
+    Class to represent a connection to the SQLite database.
+
+    Each table keeps the record as a JSON document plus the columns and side tables used by the indexes: the
+    accent-folded search key, the ISO birthdate, the normalized document numbers and the activities. An FTS5 table,
+    kept in sync by triggers, indexes the name, document numbers, school, address and contacts for full-text search.
+    The schema version is kept in `PRAGMA user_version`, databases created before the full-text table are filled on
+    open.
+
+    It offers the same session API as `LocalConnection`. Leaving the `with` block commits the transaction, or rolls it
+    back if an exception was raised.
+    """
+
+    session: Optional[sqlite3.Connection] = None
+
+    def __init__(self) -> None:
+        self.database: Optional[sqlite3.Connection] = None
+        self.owns_database = False
+
+    def __enter__(self, *args, **kwargs) -> 'SqliteConnection':
+        if SqliteConnection.session is not None:
+            self.database = SqliteConnection.session
+            self.owns_database = False
+        else:
+            self.database = SqliteConnection.create_database()
+            self.owns_database = True
+        return self
+
+    def __exit__(self, exc_type, *args, **kwargs) -> None:
+        if exc_type is None:
+            self.database.commit()
+        else:
+            self.database.rollback()
+
+        if self.owns_database:
+            self.database.close()
+        self.database = None
+        self.owns_database = False
+
+    @staticmethod
+    def create_database(path: Optional[Path] = None) -> sqlite3.Connection:
+        """
+        Open the SQLite database, creating the schema if needed.
+
+        :param path: The database file, `constants.SQLITE_DATABASE_PATH` by default.
+
+        :return: The sqlite3 connection.
+        """
+        database = sqlite3.connect(path or constants.SQLITE_DATABASE_PATH)
+        database.execute('PRAGMA foreign_keys = ON')
+        database.execute(f'PRAGMA journal_mode = {constants.SQLITE_JOURNAL_MODE}')
+        database.executescript(''.join(SCHEMA.format(table=table) for table in TABLES))
+        database.executescript(RECORD_SCHEMAS.format(table=RECORD_SCHEMAS_TABLE))
+        database.executescript(
+            ''.join(FULL_TEXT_SCHEMA.format(table=table, **full_text_expressions(table)) for table in TABLES)
+        )
+
+        (version,) = database.execute('PRAGMA user_version').fetchone()
+        if version < SCHEMA_VERSION:
+            database.executescript(
+                'BEGIN;'
+                + ''.join(FULL_TEXT_FILL.format(table=table, **full_text_expressions(table)) for table in TABLES)
+                + f'PRAGMA user_version = {SCHEMA_VERSION};'
+                + 'COMMIT;'
+            )
+
+        return database
+
+    @staticmethod
+    def open_session() -> sqlite3.Connection:
+        """
+        Open the process-wide database session, if it is not open yet.
+
+        :return: The shared sqlite3 connection.
+        """
+        if SqliteConnection.session is None:
+            SqliteConnection.session = SqliteConnection.create_database()
+        return SqliteConnection.session
+
+    @staticmethod
+    def close_session() -> None:
+        """
+        Close the process-wide database session, if it is open.
+
+        :return: None
+        """
+        if SqliteConnection.session is not None:
+            SqliteConnection.session.commit()
+            SqliteConnection.session.close()
+            SqliteConnection.session = None
+
+    @staticmethod
+    def flush() -> None:
+        """
+        Commit the pending transaction of the session.
+
+        :return: None
+        """
+        if SqliteConnection.session is not None:
+            SqliteConnection.session.commit()
+
+    @staticmethod
+    def flush_if_due() -> None:
+        """
+        SQLite writes are committed by each operation, so there is nothing to flush in the background.
+
+        :return: None
+        """
@@ -0,0 +1,2 @@
+from .sqlite_converter import convert_json_to_sqlite  # isort:skip
+from .message_pack_converter import convert_json_to_msgpack, convert_msgpack_to_json  # isort:skip
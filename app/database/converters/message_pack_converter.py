@@ -0,0 +1,51 @@
+import json
+import os
+from pathlib import Path
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional.
+    msgpack = None
+
+
+def convert_json_to_msgpack(json_path: Path, msgpack_path: Path) -> None:
+    """
+    Convert a TinyDB JSON database into a MessagePack database.
+
+    :param json_path: The JSON database, like `database.json`.
+    :param msgpack_path: The MessagePack database to write.
+
+    :return: None
+    """
+    if msgpack is None:
+        raise ImportError('The MessagePack converter needs the msgpack package: pip install msgpack')
+
+    with open(json_path, encoding='utf-8') as file:
+        content = file.read()
+    tables = json.loads(content) if content.strip() else {}
+
+    temporary_path = msgpack_path.with_name(msgpack_path.name + '.tmp')
+    temporary_path.write_bytes(msgpack.packb(tables, use_bin_type=True))
+    os.replace(temporary_path, msgpack_path)
+
+
+def convert_msgpack_to_json(msgpack_path: Path, json_path: Path, indent: int = 2) -> None:
+    """
+    Convert a MessagePack database back into a TinyDB JSON database.
+
+    :param msgpack_path: The MessagePack database, like `database.msgpack`.
+    :param json_path: The JSON database to write.
+    :param indent: The JSON indentation, None for a compact file.
+
+    :return: None
+    """
+    if msgpack is None:
+        raise ImportError('The MessagePack converter needs the msgpack package: pip install msgpack')
+
+    content = msgpack_path.read_bytes()
+    tables = msgpack.unpackb(content, raw=False) if content else {}
+
+    temporary_path = json_path.with_name(json_path.name + '.tmp')
+    with open(temporary_path, mode='w', encoding='utf-8') as file:
+        json.dump(tables, file, indent=indent, ensure_ascii=False)
+    os.replace(temporary_path, json_path)
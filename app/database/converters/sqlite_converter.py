@@ -0,0 +1,47 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+from app.database.connections import SqliteConnection
+from app.database.repositories import SqliteAdultRepository, SqliteChildRepository
+
+SQLITE_REPOSITORIES = (SqliteAdultRepository, SqliteChildRepository)
+
+
+def convert_json_to_sqlite(json_path: Path, sqlite_path: Path) -> Dict[str, int]:
+    """
+    Copy every record of a TinyDB JSON database into a new SQLite database, keeping the doc_ids.
+
+    The SQLite database is written to a temporary file, in a single transaction, and renamed only when it is
+    complete, so a failed conversion never leaves a half-filled database behind.
+
+    :param json_path: The TinyDB JSON database, like `database.json`.
+    :param sqlite_path: The SQLite database to create.
+
+    :return: A dictionary with table names as keys and the number of copied records as values.
+    """
+    with open(json_path, encoding='utf-8') as file:
+        content = file.read()
+    tables = json.loads(content) if content.strip() else {}
+
+    temporary_path = sqlite_path.with_name(sqlite_path.name + '.tmp')
+    if temporary_path.exists():
+        temporary_path.unlink()
+
+    result = {}
+    database = SqliteConnection.create_database(temporary_path)
+
+    try:
+        with database:
+            for repository in SQLITE_REPOSITORIES:
+                documents = tables.get(repository.table_name, {})
+                for doc_id, values in documents.items():
+                    repository.write_document(database, int(doc_id), values)
+                result[repository.table_name] = len(documents)
+
+    finally:
+        database.close()
+
+    os.replace(temporary_path, sqlite_path)
+    return result
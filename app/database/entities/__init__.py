@@ -1,2 +1,5 @@
 from .child_entity import ChildEntity  # isort:skip
 from .adult_entity import AdultEntity  # isort:skip
+from .lazy_record import LazyRecord  # isort:skip
+from .child_record import ChildRecord  # isort:skip
+from .adult_record import AdultRecord  # isort:skip
@@ -1,12 +1,37 @@
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass
 from typing import List, Tuple
 
 
 @dataclass
 class AdultEntity:
-    """Class to represent an adult."""
+    """
+    Class to represent an adult.
+
+    Instances have `__slots__` instead of a `__dict__`. `adult_id` and `adult_version` are slots set by the repositories
+    after the entity is built, not constructor arguments. The categorical attributes are interned, so cached entities
+    share those strings.
+    """
+
+    __slots__ = (
+        'adult_id',
+        'adult_version',
+        'adult_gender',
+        'adult_name',
+        'adult_birthdate',
+        'adult_cpf',
+        'adult_rg',
+        'adult_ethnicity',
+        'adult_religion',
+        'adult_marital_status',
+        'adult_household_income',
+        'adult_residents',
+        'adult_housing',
+        'adult_activities',
+        'adult_address',
+        'adult_contacts',
+    )
 
-    adult_id: int = field(init=False)
     adult_gender: str
     adult_name: str
     adult_birthdate: str
@@ -23,4 +48,12 @@ class AdultEntity:
     adult_contacts: List[str]
 
     def __post_init__(self) -> None:
-        self.adult_first_name = self.adult_name.split(' ')[0]
+        self.adult_gender = sys.intern(self.adult_gender)
+        self.adult_ethnicity = sys.intern(self.adult_ethnicity)
+        self.adult_religion = sys.intern(self.adult_religion)
+        self.adult_marital_status = sys.intern(self.adult_marital_status)
+        self.adult_household_income = sys.intern(self.adult_household_income)
+
+    @property
+    def adult_first_name(self) -> str:
+        return self.adult_name.split(' ')[0]
@@ -0,0 +1,14 @@
+from app.database.entities.adult_entity import AdultEntity
+from app.database.entities.lazy_record import LazyRecord
+
+
+class AdultRecord(LazyRecord):
+    """Class to represent a lazily hydrated adult, see `LazyRecord`."""
+
+    __slots__ = ()
+
+    entity_class = AdultEntity
+    id_attribute = 'adult_id'
+    version_attribute = 'adult_version'
+    schema_attribute = 'adult_schema'
+    birthdate_attribute = 'adult_birthdate'
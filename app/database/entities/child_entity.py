@@ -1,12 +1,46 @@
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass
 from typing import List, Tuple
 
 
 @dataclass
 class ChildEntity:
-    """Class to represent a child."""
+    """
+    Class to represent a child.
+
+    Instances have `__slots__` instead of a `__dict__`. `child_id` and `child_version` are slots set by the repositories
+    after the entity is built, not constructor arguments. The categorical attributes are interned, so cached entities
+    share those strings.
+    """
+
+    __slots__ = (
+        'child_id',
+        'child_version',
+        'child_gender',
+        'child_name',
+        'child_birthdate',
+        'child_cpf',
+        'child_rg',
+        'child_ethnicity',
+        'child_religion',
+        'child_clothing_number',
+        'child_shoe_number',
+        'child_school_name',
+        'child_school_degree',
+        'child_school_period',
+        'child_activities',
+        'parent_name',
+        'parent_gender',
+        'parent_birthdate',
+        'parent_cpf',
+        'parent_rg',
+        'parent_household_income',
+        'parent_housing',
+        'parent_authorization',
+        'parent_address',
+        'parent_contacts',
+    )
 
-    child_id: int = field(init=False)
     child_gender: str
     child_name: str
     child_birthdate: str
@@ -33,4 +67,15 @@ class ChildEntity:
     parent_contacts: List[str]
 
     def __post_init__(self) -> None:
-        self.child_first_name = self.child_name.split(' ')[0]
+        self.child_gender = sys.intern(self.child_gender)
+        self.child_ethnicity = sys.intern(self.child_ethnicity)
+        self.child_religion = sys.intern(self.child_religion)
+        self.child_school_degree = sys.intern(self.child_school_degree)
+        self.child_school_period = sys.intern(self.child_school_period)
+        self.parent_gender = sys.intern(self.parent_gender)
+        self.parent_household_income = sys.intern(self.parent_household_income)
+        self.parent_authorization = sys.intern(self.parent_authorization)
+
+    @property
+    def child_first_name(self) -> str:
+        return self.child_name.split(' ')[0]
@@ -0,0 +1,14 @@
+from app.database.entities.child_entity import ChildEntity
+from app.database.entities.lazy_record import LazyRecord
+
+
+class ChildRecord(LazyRecord):
+    """Class to represent a lazily hydrated child, see `LazyRecord`."""
+
+    __slots__ = ()
+
+    entity_class = ChildEntity
+    id_attribute = 'child_id'
+    version_attribute = 'child_version'
+    schema_attribute = 'child_schema'
+    birthdate_attribute = 'child_birthdate'
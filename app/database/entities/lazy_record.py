@@ -0,0 +1,99 @@
+from datetime import date
+from typing import Any, Dict, Optional, Type, Union
+
+from app.utils.formats import format_str_to_date
+
+
+class LazyRecord:
+    """
+    Class to represent a read-only view of a stored record, for list views.
+
+    It wraps the stored document and answers the entity attributes from it, without building the entity. The ID
+    attribute is answered by the document ID, the version attribute defaults to 0 and the properties of the entity
+    class, like the first name, are computed on first access and kept. `to_entity` builds the full entity, once,
+    when a form or a PDF needs it.
+
+    Subclasses define the entity class, its ID, version and record schema attributes and its birthdate attribute.
+    """
+
+    __slots__ = ('document', 'doc_id', 'values', 'entity')
+
+    entity_class: Type = object
+    id_attribute: str = ''
+    version_attribute: str = ''
+    schema_attribute: str = ''
+    birthdate_attribute: str = ''
+
+    def __init__(self, document: Dict[str, Any], doc_id: int) -> None:
+        """
+        Initialize the LazyRecord.
+
+        :param document: The stored document, upgraded to the latest record schema. It must not be changed afterwards.
+        :param doc_id: The document ID.
+        """
+        self.document = document
+        self.doc_id = doc_id
+        self.values: Optional[Dict[str, Any]] = None
+        self.entity: Optional[Any] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name == self.id_attribute:
+            return self.doc_id
+
+        if name in self.document:
+            return self.document[name]
+
+        if name == self.version_attribute:
+            return 0
+
+        if self.values is not None and name in self.values:
+            return self.values[name]
+
+        attribute = getattr(self.entity_class, name, None)
+        if isinstance(attribute, property):
+            return self.keep(name, attribute.fget(self))
+
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(doc_id={self.doc_id})'
+
+    def keep(self, name: str, value: Any) -> Any:
+        """
+        Keep a computed value for the next accesses.
+
+        :param name: The value name.
+        :param value: The computed value.
+
+        :return: The value.
+        """
+        if self.values is None:
+            self.values = {}
+        self.values[name] = value
+        return value
+
+    @property
+    def birthdate(self) -> Union[date, str]:
+        """
+        The parsed birthdate, or the stored string if it can not be parsed.
+
+        :return: The birthdate.
+        """
+        if self.values is not None and 'birthdate' in self.values:
+            return self.values['birthdate']
+        return self.keep('birthdate', format_str_to_date(self.document[self.birthdate_attribute]))
+
+    def to_entity(self) -> Any:
+        """
+        Build the full entity, on the first call only.
+
+        :return: The entity, with its ID attribute set to the document ID and its version attribute set.
+        """
+        if self.entity is None:
+            values = dict(self.document)
+            version = values.pop(self.version_attribute, 0)
+            values.pop(self.schema_attribute, None)
+            self.entity = self.entity_class(**values)
+            setattr(self.entity, self.id_attribute, self.doc_id)
+            setattr(self.entity, self.version_attribute, version)
+        return self.entity
@@ -0,0 +1,49 @@
+from pathlib import Path
+from typing import List
+
+
+class VersionConflictError(Exception):
+    """
+    Raised when a record is saved from an outdated copy.
+
+    Each record keeps a version counter that every update increments. Updating with the version the record had when
+    it was loaded fails with this error if someone else saved it in the meantime.
+    """
+
+    def __init__(self, doc_id: int, expected_version: int, current_version: int) -> None:
+        """
+        Initialize the VersionConflictError.
+
+        :param doc_id: The ID of the record.
+        :param expected_version: The version the record had when it was loaded.
+        :param current_version: The version the record has now.
+        """
+        super().__init__(
+            f'O registro {doc_id} foi alterado por outra pessoa enquanto estava aberto. '
+            'Feche o formulário e abra o registro novamente para ver as alterações.'
+        )
+        self.doc_id = doc_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+class StorageFormatError(Exception):
+    """
+    Raised when the configured storage finds no database, while the database is kept next to it in another format.
+
+    Opening the storage would silently start an empty database, so the files are listed instead.
+    """
+
+    def __init__(self, storage: str, paths: List[Path]) -> None:
+        """
+        Initialize the StorageFormatError.
+
+        :param storage: The configured storage format.
+        :param paths: The files, or directories, of the other formats.
+        """
+        super().__init__(
+            f'No database was found in the {storage!r} format, but these files are in other formats: '
+            f'{", ".join(path.name for path in paths)}. Convert the database, or configure the storage it is kept in.'
+        )
+        self.storage = storage
+        self.paths = paths
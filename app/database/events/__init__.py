@@ -0,0 +1,2 @@
+from .change_event import ChangeEvent  # isort:skip
+from .change_feed import ChangeFeed  # isort:skip
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    Class to represent a change made to a stored record.
+
+    `kind` is one of `ChangeEvent.INSERTED`, `ChangeEvent.UPDATED` or `ChangeEvent.DELETED`.
+    """
+
+    INSERTED = 'inserted'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+
+    kind: str
+    table: str
+    doc_id: int
@@ -0,0 +1,72 @@
+import logging
+import time
+from typing import Callable, List, Optional, Sequence
+
+from app.database.events.change_event import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+Subscriber = Callable[[List[ChangeEvent]], None]
+
+
+class ChangeFeed:
+    """
+    Class to deliver the changes made by a repository to its subscribers.
+
+    Every write operation publishes, once it is committed, a list with one event per changed record, so a bulk
+    operation reaches the subscribers in a single call. Subscribers are called in the order they subscribed. The write
+    is already done when they run, so an error raised by a subscriber is logged and does not stop the others.
+
+    `last_published_at` is the `time.monotonic` time of the last write operation, to know when the user stopped
+    saving records.
+    """
+
+    def __init__(self) -> None:
+        self.subscribers: List[Subscriber] = []
+        self.last_published_at: Optional[float] = None
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        """
+        Add a subscriber.
+
+        :param subscriber: A function called with the list of events of each write operation.
+
+        :return: None
+        """
+        self.subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """
+        Remove a subscriber, if it is subscribed.
+
+        :param subscriber: The subscriber to remove.
+
+        :return: None
+        """
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+
+    def publish(self, kind: str, table: str, doc_ids: Sequence[int]) -> None:
+        """
+        Publish the events of a write operation.
+
+        :param kind: The kind of change, one of the `ChangeEvent` kinds.
+        :param table: The name of the changed table.
+        :param doc_ids: The document IDs of the changed records. Nothing is published when it is empty.
+
+        :return: None
+        """
+        if not doc_ids:
+            return
+
+        self.last_published_at = time.monotonic()
+        if not self.subscribers:
+            return
+
+        events = [ChangeEvent(kind, table, doc_id) for doc_id in doc_ids]
+
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber(events)
+            except Exception:
+                logger.exception('change feed subscriber %r failed', subscriber)
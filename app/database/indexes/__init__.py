@@ -0,0 +1,4 @@
+from .hash_index import HashIndex  # isort:skip
+from .trigram_index import TrigramIndex  # isort:skip
+from .activity_index import ActivityIndex  # isort:skip
+from .date_index import DateIndex  # isort:skip
@@ -0,0 +1,69 @@
+from collections import defaultdict
+from typing import Any, Dict, Set
+
+
+class ActivityIndex:
+    """
+    Class to represent an inverted index from activity name to the doc_ids of the entities enrolled in it.
+
+    The number of entities enrolled in an activity is the size of its doc_id set, so counts need no scan either.
+    """
+
+    def __init__(self, attribute: str) -> None:
+        """
+        Initialize the ActivityIndex.
+
+        :param attribute: The entity attribute holding the list of activities.
+        """
+        self.attribute = attribute
+        self.activities: Dict[str, Set[int]] = defaultdict(set)
+
+    def clear(self) -> None:
+        """Remove every activity from the index."""
+        self.activities.clear()
+
+    def add(self, doc_id: int, entity: Any) -> None:
+        """
+        Index the activities of an entity.
+
+        :param doc_id: The document ID of the entity.
+        :param entity: The entity.
+
+        :return: None
+        """
+        for activity in getattr(entity, self.attribute):
+            self.activities[activity].add(doc_id)
+
+    def remove(self, doc_id: int, entity: Any) -> None:
+        """
+        Remove the activities of an entity from the index.
+
+        :param doc_id: The document ID of the entity.
+        :param entity: The entity, as it was indexed.
+
+        :return: None
+        """
+        for activity in getattr(entity, self.attribute):
+            doc_ids = self.activities.get(activity)
+            if doc_ids is not None:
+                doc_ids.discard(doc_id)
+                if not doc_ids:
+                    del self.activities[activity]
+
+    def find(self, activity: str) -> Set[int]:
+        """
+        Get the doc_ids enrolled in an activity.
+
+        :param activity: The activity name.
+
+        :return: A set of doc_ids.
+        """
+        return set(self.activities.get(activity, ()))
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Count the entities enrolled in each activity.
+
+        :return: A dictionary with activities as keys and counts as values.
+        """
+        return {activity: len(doc_ids) for activity, doc_ids in self.activities.items()}
@@ -0,0 +1,97 @@
+import bisect
+import math
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.utils.formats import format_str_to_date
+
+
+class DateIndex:
+    """
+    Class to represent a sorted index over a date attribute stored as a string.
+
+    The attribute is parsed once when the entity is added. Entities whose value can not be parsed are kept in the
+    `unparsed` bucket instead of being parsed again on every query. The sorted list of (date, doc_id) pairs is built
+    lazily on the first range query and patched with bisect afterwards.
+    """
+
+    def __init__(self, attribute: str) -> None:
+        """
+        Initialize the DateIndex.
+
+        :param attribute: The entity attribute holding the date string.
+        """
+        self.attribute = attribute
+        self.dates: Dict[int, Optional[date]] = {}
+        self.unparsed: Set[int] = set()
+        self.sorted_dates: List[Tuple[date, int]] = []
+        self.built = False
+
+    def clear(self) -> None:
+        """Remove every entity from the index."""
+        self.dates.clear()
+        self.unparsed.clear()
+        self.sorted_dates.clear()
+        self.built = False
+
+    def add(self, doc_id: int, entity: Any) -> None:
+        """
+        Parse and index the date of an entity.
+
+        :param doc_id: The document ID of the entity.
+        :param entity: The entity.
+
+        :return: None
+        """
+        value = format_str_to_date(getattr(entity, self.attribute))
+
+        if not isinstance(value, date):
+            self.dates[doc_id] = None
+            self.unparsed.add(doc_id)
+            return
+
+        self.dates[doc_id] = value
+        if self.built:
+            bisect.insort(self.sorted_dates, (value, doc_id))
+
+    def remove(self, doc_id: int, entity: Any) -> None:
+        """
+        Remove an entity from the index.
+
+        :param doc_id: The document ID of the entity.
+        :param entity: The entity, as it was indexed.
+
+        :return: None
+        """
+        value = self.dates.pop(doc_id, None)
+        self.unparsed.discard(doc_id)
+
+        if value is not None and self.built:
+            position = bisect.bisect_left(self.sorted_dates, (value, doc_id))
+            if position < len(self.sorted_dates) and self.sorted_dates[position] == (value, doc_id):
+                del self.sorted_dates[position]
+
+    def build(self) -> None:
+        """
+        Build the sorted list from the parsed dates.
+
+        :return: None
+        """
+        self.sorted_dates = sorted((value, doc_id) for doc_id, value in self.dates.items() if value is not None)
+        self.built = True
+
+    def between(self, start: date, end: date) -> List[Tuple[date, int]]:
+        """
+        Find the entities whose date is between two dates, both inclusive.
+
+        :param start: The first date of the range.
+        :param end: The last date of the range.
+
+        :return: A list of (date, doc_id) pairs, sorted by date.
+        """
+        if not self.built:
+            self.build()
+
+        low = bisect.bisect_left(self.sorted_dates, (start, -math.inf))
+        high = bisect.bisect_right(self.sorted_dates, (end, math.inf))
+        return self.sorted_dates[low:high]
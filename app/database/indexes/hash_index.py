@@ -0,0 +1,76 @@
+from collections import defaultdict
+from typing import Any, Callable, Dict, Set, Tuple
+
+
+class HashIndex:
+    """
+    Class to represent an exact-match index over some entity attributes.
+
+    Each attribute value is normalized into a key, and every key points to the set of doc_ids holding it.
+    Empty keys are not indexed.
+    """
+
+    def __init__(self, attributes: Tuple[str, ...], normalize: Callable[[str], str]) -> None:
+        """
+        Initialize the HashIndex.
+
+        :param attributes: The entity attributes to index.
+        :param normalize: A function turning an attribute value into an index key.
+        """
+        self.attributes = attributes
+        self.normalize = normalize
+        self.keys: Dict[str, Set[int]] = defaultdict(set)
+
+    def entity_keys(self, entity: Any) -> Set[str]:
+        """
+        Get the index keys of an entity.
+
+        :param entity: The entity.
+
+        :return: A set of non-empty keys.
+        """
+        keys = {self.normalize(getattr(entity, attribute)) for attribute in self.attributes}
+        keys.discard('')
+        return keys
+
+    def clear(self) -> None:
+        """Remove every key from the index."""
+        self.keys.clear()
+
+    def add(self, doc_id: int, entity: Any) -> None:
+        """
+        Index an entity.
+
+        :param doc_id: The document ID of the entity.
+        :param entity: The entity.
+
+        :return: None
+        """
+        for key in self.entity_keys(entity):
+            self.keys[key].add(doc_id)
+
+    def remove(self, doc_id: int, entity: Any) -> None:
+        """
+        Remove an entity from the index.
+
+        :param doc_id: The document ID of the entity.
+        :param entity: The entity, as it was indexed.
+
+        :return: None
+        """
+        for key in self.entity_keys(entity):
+            doc_ids = self.keys.get(key)
+            if doc_ids is not None:
+                doc_ids.discard(doc_id)
+                if not doc_ids:
+                    del self.keys[key]
+
+    def find(self, value: str) -> Set[int]:
+        """
+        Find the doc_ids holding a value.
+
+        :param value: The searched value, normalized before the lookup.
+
+        :return: A set of doc_ids.
+        """
+        return set(self.keys.get(self.normalize(value), ()))
@@ -0,0 +1,129 @@
+from collections import defaultdict
+from typing import Any, Callable, Dict, Set, Tuple
+
+from app.utils.formats import format_search_key
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Split a text into its 3-character substrings.
+
+    :param text: The text.
+
+    :return: A set of trigrams, empty when the text is shorter than three characters.
+    """
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Class to represent a trigram (3-gram) inverted index for substring search over some entity attributes.
+
+    The search keys of an entity, its attribute values passed through `normalize`, are computed once when the entity is
+    added and kept in `keys`. Every trigram of the search keys points to the set of doc_ids containing it. A substring
+    search intersects the posting lists of the searched trigrams to get the candidates, which are then verified
+    against their search keys. A term shorter than a trigram is searched by scanning the search keys.
+
+    The posting lists are built lazily, on the first search after the cache is loaded, and patched incrementally
+    afterwards.
+    """
+
+    def __init__(self, attributes: Tuple[str, ...], normalize: Callable[[str], str] = format_search_key) -> None:
+        """
+        Initialize the TrigramIndex.
+
+        :param attributes: The entity attributes to index.
+        :param normalize: A function applied to attribute values and searched terms before splitting them.
+        """
+        self.attributes = attributes
+        self.normalize = normalize
+        self.keys: Dict[int, Tuple[str, ...]] = {}
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.built = False
+
+    def clear(self) -> None:
+        """Drop the index, the posting lists will be rebuilt on the next search."""
+        self.keys.clear()
+        self.postings.clear()
+        self.built = False
+
+    def add(self, doc_id: int, entity: Any) -> None:
+        """
+        Compute the search keys of an entity and index them, if the posting lists are built.
+
+        :param doc_id: The document ID of the entity.
+        :param entity: The entity.
+
+        :return: None
+        """
+        keys = tuple(self.normalize(getattr(entity, attribute)) for attribute in self.attributes)
+        self.keys[doc_id] = keys
+
+        if self.built:
+            self.add_postings(doc_id, keys)
+
+    def remove(self, doc_id: int, entity: Any) -> None:
+        """
+        Remove an entity from the index.
+
+        :param doc_id: The document ID of the entity.
+        :param entity: The entity, as it was indexed.
+
+        :return: None
+        """
+        keys = self.keys.pop(doc_id, ())
+
+        if self.built:
+            for key in keys:
+                for trigram in trigrams(key):
+                    doc_ids = self.postings.get(trigram)
+                    if doc_ids is not None:
+                        doc_ids.discard(doc_id)
+                        if not doc_ids:
+                            del self.postings[trigram]
+
+    def add_postings(self, doc_id: int, keys: Tuple[str, ...]) -> None:
+        """
+        Add a doc_id to the posting lists of its search keys.
+
+        :param doc_id: The document ID.
+        :param keys: The search keys of the document.
+
+        :return: None
+        """
+        for key in keys:
+            for trigram in trigrams(key):
+                self.postings[trigram].add(doc_id)
+
+    def build(self) -> None:
+        """
+        Build the posting lists from the search keys.
+
+        :return: None
+        """
+        self.postings.clear()
+        self.built = True
+        for doc_id, keys in self.keys.items():
+            self.add_postings(doc_id, keys)
+
+    def search(self, term: str) -> Set[int]:
+        """
+        Find the doc_ids whose search keys contain a term.
+
+        A term shorter than a trigram has no posting list, so the search keys are scanned instead.
+
+        :param term: The searched term.
+
+        :return: A set of doc_ids.
+        """
+        term = self.normalize(term)
+        if len(term) < 3:
+            return {doc_id for doc_id, keys in self.keys.items() if any(term in key for key in keys)}
+
+        if not self.built:
+            self.build()
+
+        postings = sorted((self.postings.get(trigram, set()) for trigram in trigrams(term)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:]) if postings else set()
+
+        return {doc_id for doc_id in candidates if any(term in key for key in self.keys[doc_id])}
@@ -0,0 +1,2 @@
+from .lock_statistics import LockStatistics  # isort:skip
+from .file_lock import FileLock  # isort:skip
@@ -0,0 +1,267 @@
+import logging
+import os
+import socket
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from app.database.locks.lock_statistics import LockStatistics
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fcntl is not available on Windows.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """
+    Class to represent an advisory lock shared by the processes, and computers, using a database file.
+
+    With fcntl, `database.json.lock` is locked with `flock`: readers take a shared lock and never block each other,
+    writers take an exclusive lock. Without fcntl, or with `use_fcntl=False`, the lock is the existence of the
+    `database.json.lck` file, created atomically; readers and writers both take it, and a lock file older than
+    `stale_seconds`, left by a crashed process, is removed (see `remove_stale_file`). Processes must use the same kind
+    of lock to see each other, so offices mixing Linux and Windows desks must use the lock file everywhere.
+
+    The database file itself is never locked, so storages may replace it with a rename. The time each operation waited
+    for the lock and held it is recorded in `shared_statistics` and `exclusive_statistics` and logged at debug level.
+
+    The lock is reentrant: while it is held, operations run under it without taking it again. A shared lock can not be
+    upgraded to an exclusive one. `FileLock.get` hands out a single instance per file, so the TinyDB instances of a
+    process never wait for each other. It is not meant to be used by several threads.
+    """
+
+    instances: Dict[Path, 'FileLock'] = {}
+
+    def __init__(
+        self,
+        path: str,
+        use_fcntl: bool = True,
+        timeout: float = 30.0,
+        stale_seconds: float = 120.0,
+        poll_seconds: float = 0.05,
+    ) -> None:
+        """
+        Initialize the FileLock.
+
+        :param path: The database file.
+        :param use_fcntl: Whether to use fcntl locks when they are available.
+        :param timeout: The seconds to wait for the lock before raising TimeoutError.
+        :param stale_seconds: The age after which a lock file is considered abandoned.
+        :param poll_seconds: The interval between two attempts to take the lock.
+        """
+        database_path = Path(path)
+        self.use_fcntl = use_fcntl and fcntl is not None
+        self.path = database_path.with_name(database_path.name + ('.lock' if self.use_fcntl else '.lck'))
+        self.timeout = timeout
+        self.stale_seconds = stale_seconds
+        self.poll_seconds = poll_seconds
+        self.shared_statistics = LockStatistics()
+        self.exclusive_statistics = LockStatistics()
+        self.held: Optional[str] = None
+        self.owner: Optional[str] = None
+
+    @classmethod
+    def get(cls, path: str, use_fcntl: bool = True, timeout: float = 30.0, stale_seconds: float = 120.0) -> 'FileLock':
+        """
+        Get the lock of a database file, creating it on the first call.
+
+        :param path: The database file.
+        :param use_fcntl: Whether to use fcntl locks when they are available.
+        :param timeout: The seconds to wait for the lock before raising TimeoutError.
+        :param stale_seconds: The age after which a lock file is considered abandoned.
+
+        :return: The lock.
+        """
+        lock = cls(path, use_fcntl, timeout, stale_seconds)
+        return cls.instances.setdefault(lock.path.resolve(), lock)
+
+    @contextmanager
+    def shared(self, operation: str = 'read') -> Iterator[None]:
+        """
+        Hold the lock in shared mode, for reading.
+
+        :param operation: The operation name, for the statistics.
+
+        :return: A context manager.
+        """
+        with self.hold(operation, exclusive=False):
+            yield
+
+    @contextmanager
+    def exclusive(self, operation: str = 'write') -> Iterator[None]:
+        """
+        Hold the lock in exclusive mode, for writing.
+
+        :param operation: The operation name, for the statistics.
+
+        :return: A context manager.
+        """
+        with self.hold(operation, exclusive=True):
+            yield
+
+    @contextmanager
+    def hold(self, operation: str, exclusive: bool) -> Iterator[None]:
+        """
+        Take the lock, measure the wait and hold times and release it.
+
+        :param operation: The operation name, for the statistics.
+        :param exclusive: Whether to take the lock in exclusive mode.
+
+        :return: A context manager.
+        """
+        if self.held is not None:
+            if exclusive and self.held != 'exclusive':
+                raise RuntimeError('A shared database lock can not be upgraded to an exclusive one')
+            yield
+            return
+
+        start = time.perf_counter()
+        descriptor = self.acquire_fcntl(exclusive) if self.use_fcntl else self.acquire_file()
+        acquired = time.perf_counter()
+        self.held = 'exclusive' if exclusive else 'shared'
+
+        try:
+            yield
+
+        finally:
+            self.held = None
+            if self.use_fcntl:
+                os.close(descriptor)
+            else:
+                self.release_file()
+
+            released = time.perf_counter()
+            statistics = self.exclusive_statistics if exclusive else self.shared_statistics
+            statistics.record(operation, acquired - start, released - acquired)
+            logger.debug(
+                '%s %s lock on %s: waited %.1f ms, held %.1f ms',
+                operation,
+                'exclusive' if exclusive else 'shared',
+                self.path.name,
+                (acquired - start) * 1000,
+                (released - acquired) * 1000,
+            )
+
+    def acquire_fcntl(self, exclusive: bool) -> int:
+        """
+        Take the fcntl lock, waiting for it up to the timeout.
+
+        :param exclusive: Whether to take the lock in exclusive mode.
+
+        :return: The lock file descriptor, closing it releases the lock.
+        """
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        operation = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                fcntl.flock(descriptor, operation)
+                return descriptor
+
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(descriptor)
+                    raise TimeoutError(f'Timed out waiting for the database lock: {self.path}')
+                time.sleep(self.poll_seconds)
+
+    def acquire_file(self) -> None:
+        """
+        Create the lock file, waiting for it to be removed up to the timeout.
+
+        :return: None
+        """
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                descriptor = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+
+            except FileExistsError:
+                if self.remove_stale_file():
+                    continue
+
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f'Timed out waiting for the database lock: {self.path}')
+                time.sleep(self.poll_seconds)
+
+            else:
+                self.owner = f'{socket.gethostname()} {os.getpid()} {uuid.uuid4().hex}'
+                os.write(descriptor, f'{self.owner}\n'.encode())
+                os.close(descriptor)
+                return
+
+    def remove_stale_file(self) -> bool:
+        """
+        Remove the lock file if it is older than `stale_seconds`.
+
+        Checking the age and removing the file is not atomic: another process may remove the abandoned file and take
+        the lock in between, and removing its fresh file would let both hold the lock. So the file is renamed to a
+        name of its own first, which only one process can do, and its age is checked again there. A fresh file belongs
+        to a live process and is put back.
+
+        :return: True if the lock file is gone, False if it is held.
+        """
+        age = self.lock_file_age()
+        if age is None:
+            return True
+        if age <= self.stale_seconds:
+            return False
+
+        claimed_path = self.path.with_name(f'{self.path.name}.{uuid.uuid4().hex}')
+        try:
+            os.rename(self.path, claimed_path)
+        except FileNotFoundError:
+            return True
+
+        # Renaming keeps the modification time.
+        age = time.time() - claimed_path.stat().st_mtime
+        if age > self.stale_seconds:
+            logger.warning('Removing the abandoned database lock %s (%.0f s old)', self.path, age)
+            os.unlink(claimed_path)
+            return True
+
+        try:
+            if os.name == 'nt':
+                # On Windows, rename never replaces an existing file.
+                os.rename(claimed_path, self.path)
+            else:
+                os.link(claimed_path, self.path)
+                os.unlink(claimed_path)
+        except FileExistsError:
+            logger.warning('The database lock %s was taken while it was put back', self.path)
+            os.unlink(claimed_path)
+        return False
+
+    def lock_file_age(self) -> Optional[float]:
+        """
+        Get the age of the lock file.
+
+        :return: The seconds since the lock file was created, or None if it does not exist anymore.
+        """
+        try:
+            return time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def release_file(self) -> None:
+        """
+        Remove the lock file, unless another process took it over as abandoned.
+
+        :return: None
+        """
+        try:
+            owner = self.path.read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            return
+
+        if owner != self.owner:
+            logger.warning('The database lock %s was taken over by %s while it was held', self.path, owner)
+            return
+
+        os.unlink(self.path)
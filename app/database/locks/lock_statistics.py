@@ -0,0 +1,47 @@
+from collections import deque
+from typing import Deque, Tuple
+
+
+class LockStatistics:
+    """
+    Class to measure how long the operations of a lock mode waited for the lock and held it.
+
+    Totals are kept for every acquisition and the (operation, wait, hold) times of the latest ones are kept in `recent`.
+    """
+
+    def __init__(self, recent: int = 100) -> None:
+        """
+        Initialize the LockStatistics.
+
+        :param recent: The number of latest acquisitions to keep.
+        """
+        self.count = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.hold_seconds = 0.0
+        self.max_hold_seconds = 0.0
+        self.recent: Deque[Tuple[str, float, float]] = deque(maxlen=recent)
+
+    def record(self, operation: str, wait_seconds: float, hold_seconds: float) -> None:
+        """
+        Record an acquisition.
+
+        :param operation: The name of the operation done under the lock.
+        :param wait_seconds: The time spent waiting for the lock.
+        :param hold_seconds: The time the lock was held.
+
+        :return: None
+        """
+        self.count += 1
+        self.wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        self.hold_seconds += hold_seconds
+        self.max_hold_seconds = max(self.max_hold_seconds, hold_seconds)
+        self.recent.append((operation, wait_seconds, hold_seconds))
+
+    def __str__(self) -> str:
+        average = self.wait_seconds / self.count if self.count else 0.0
+        return (
+            f'{self.count} acquisitions, wait avg {average * 1000:.1f} ms max {self.max_wait_seconds * 1000:.1f} ms, '
+            f'hold max {self.max_hold_seconds * 1000:.1f} ms'
+        )
@@ -0,0 +1,3 @@
+from .read_cache_middleware import ReadCacheMiddleware  # isort:skip
+from .write_behind_middleware import WriteBehindMiddleware  # isort:skip
+from .locking_middleware import LockingMiddleware  # isort:skip
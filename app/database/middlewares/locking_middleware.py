@@ -0,0 +1,127 @@
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from tinydb.middlewares import Middleware
+
+from app.database.locks import FileLock
+
+
+class LockingMiddleware(Middleware):
+    """
+    Middleware to coordinate the processes sharing the database file, see `FileLock`.
+
+    Reads take the lock in shared mode and writes in exclusive mode. When the wrapped storage splits its work into
+    `read_bytes` / `deserialize` and `serialize` / `write_bytes`, only the file access happens under the lock taken
+    here, so a read holds it for the time of a file copy instead of the whole parse. Writes made through
+    `LocalConnection(write=True)`, which is every repository write, already hold the exclusive lock for the whole
+    connection, so their encoding runs under it too. Other storages are read and written entirely under the lock.
+    Creating the storage, which may migrate the database file, is exclusive.
+
+    Every write also stores a new random stamp in `database.json.stamp`. `is_stale` compares it with the stamp of the
+    last read or write of this process, to know when another process changed the database.
+    """
+
+    def __init__(
+        self,
+        storage_cls,
+        use_fcntl: bool = True,
+        timeout: float = 30.0,
+        stale_seconds: float = 120.0,
+    ) -> None:
+        """
+        Initialize the LockingMiddleware.
+
+        :param storage_cls: The storage class, or middleware, to wrap.
+        :param use_fcntl: Whether to use fcntl locks when they are available, instead of a lock file.
+        :param timeout: The seconds to wait for the lock before raising TimeoutError.
+        :param stale_seconds: The age after which a lock file is considered abandoned.
+        """
+        super().__init__(storage_cls)
+        self.use_fcntl = use_fcntl
+        self.timeout = timeout
+        self.stale_seconds = stale_seconds
+        self.lock: Optional[FileLock] = None
+        self.stamp_path: Optional[Path] = None
+        self.stamp: Optional[str] = None
+
+    def __call__(self, *args, **kwargs) -> 'LockingMiddleware':
+        path = Path(args[0])
+        self.lock = FileLock.get(path, self.use_fcntl, self.timeout, self.stale_seconds)
+        self.stamp_path = path.with_name(path.name + '.stamp')
+
+        with self.lock.exclusive('open'):
+            return super().__call__(*args, **kwargs)
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Read the database under a shared lock.
+
+        :return: The database content.
+        """
+        if hasattr(self.storage, 'read_bytes'):
+            with self.lock.shared('read'):
+                self.stamp = self.read_stamp()
+                content = self.storage.read_bytes()
+            return self.storage.deserialize(content)
+
+        with self.lock.shared('read'):
+            self.stamp = self.read_stamp()
+            return self.storage.read()
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write the database under an exclusive lock.
+
+        :param data: The database content.
+
+        :return: None
+        """
+        if hasattr(self.storage, 'write_bytes'):
+            serialized = self.storage.serialize(data)
+            with self.lock.exclusive('write'):
+                self.storage.write_bytes(serialized)
+                self.write_stamp()
+            return
+
+        with self.lock.exclusive('write'):
+            self.storage.write(data)
+            self.write_stamp()
+
+    def read_stamp(self) -> str:
+        """
+        Read the stamp of the last write of any process.
+
+        :return: The stamp, or an empty string if the database was never written with a lock.
+        """
+        try:
+            return self.stamp_path.read_text(encoding='ascii')
+        except FileNotFoundError:
+            return ''
+
+    def write_stamp(self) -> None:
+        """
+        Store a new stamp, marking the database as changed by this process.
+
+        :return: None
+        """
+        self.stamp = uuid.uuid4().hex
+        self.stamp_path.write_text(self.stamp, encoding='ascii')
+
+    def is_stale(self) -> bool:
+        """
+        Check if another process wrote the database since this process last read or wrote it.
+
+        :return: True if the data read by this process is outdated, False if it was not read yet.
+        """
+        return self.stamp is not None and self.read_stamp() != self.stamp
+
+    def close(self) -> None:
+        """
+        Close the wrapped storage under an exclusive lock, as closing may still write, like `LogStorage` finishing a
+        compaction.
+
+        :return: None
+        """
+        with self.lock.exclusive('close'):
+            self.storage.close()
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Optional
+
+from tinydb.middlewares import Middleware
+
+
+class ReadCacheMiddleware(Middleware):
+    """
+    Middleware to keep the parsed database in memory.
+
+    The wrapped storage is read only once, every following read is answered from the already loaded document.
+    Writes are forwarded to the wrapped storage right away, so the file on disk is always up to date.
+
+    TinyDB changes the documents it reads in place before writing them. When the wrapped storage fails to write, the
+    cached database holds the unsaved change, so it is dropped and the next read parses the storage again.
+
+    Between `defer_writes` and `end_deferred_writes`, writes only update the cached database, which is then written
+    once, so several operations cost a single write of the wrapped storage.
+    """
+
+    def __init__(self, storage_cls) -> None:
+        super().__init__(storage_cls)
+        self.cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self.deferring = False
+        self.deferred = False
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Read the database, parsing the wrapped storage only on the first call.
+
+        :return: The cached database content.
+        """
+        if self.cache is None:
+            self.cache = self.storage.read()
+
+        return self.cache
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write the database through to the wrapped storage and keep it as the cached database once written.
+
+        :param data: The new database content.
+
+        :return: None
+        """
+        if self.deferring:
+            self.cache = data
+            self.deferred = True
+            return
+
+        try:
+            self.storage.write(data)
+        except BaseException:
+            self.cache = None
+            raise
+
+        self.cache = data
+
+    def defer_writes(self) -> None:
+        """
+        Keep the following writes in the cached database only, until `end_deferred_writes`.
+
+        :return: None
+        """
+        self.deferring = True
+
+    def end_deferred_writes(self, save: bool = True) -> None:
+        """
+        Stop deferring the writes, and write the cached database once if a deferred write changed it.
+
+        :param save: Whether to write the deferred changes, or to drop them with the cached database.
+
+        :return: None
+        """
+        self.deferring = False
+        if not self.deferred:
+            return
+
+        self.deferred = False
+        if save:
+            self.write(self.cache)
+        else:
+            self.cache = None
+
+    def close(self) -> None:
+        """
+        Drop the cached database and close the wrapped storage.
+
+        :return: None
+        """
+        self.cache = None
+        self.storage.close()
@@ -0,0 +1,84 @@
+import time
+from typing import Any, Dict, Optional
+
+from app.database.middlewares.read_cache_middleware import ReadCacheMiddleware
+
+
+class WriteBehindMiddleware(ReadCacheMiddleware):
+    """
+    Middleware to buffer database writes in memory.
+
+    Writes only update the cached database. The wrapped storage is written when `flush_writes` writes are pending,
+    when the oldest pending write is `flush_seconds` old, when `flush_if_due` finds the database idle, on `flush` and
+    on `close`.
+    """
+
+    def __init__(self, storage_cls, flush_writes: int = 20, flush_seconds: float = 5.0) -> None:
+        """
+        Initialize the WriteBehindMiddleware.
+
+        :param storage_cls: The wrapped storage class.
+        :param flush_writes: Number of pending writes that forces a flush.
+        :param flush_seconds: Age in seconds of the oldest pending write that forces a flush.
+        """
+        super().__init__(storage_cls)
+        self.flush_writes = flush_writes
+        self.flush_seconds = flush_seconds
+        self.pending_writes = 0
+        self.first_pending_at: Optional[float] = None
+        self.last_write_at: Optional[float] = None
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Update the cached database and flush it if the durability policy asks for it.
+
+        :param data: The new database content.
+
+        :return: None
+        """
+        now = time.monotonic()
+        self.cache = data
+        self.pending_writes += 1
+        self.last_write_at = now
+
+        if self.first_pending_at is None:
+            self.first_pending_at = now
+
+        if self.pending_writes >= self.flush_writes or now - self.first_pending_at >= self.flush_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the pending changes to the wrapped storage.
+
+        :return: None
+        """
+        if self.pending_writes:
+            self.storage.write(self.cache)
+            self.pending_writes = 0
+            self.first_pending_at = None
+            self.last_write_at = None
+
+    def flush_if_due(self, idle_seconds: float) -> None:
+        """
+        Flush the pending changes if the oldest one is too old or no write happened for `idle_seconds`.
+
+        :param idle_seconds: Seconds without writes after which the database is considered idle.
+
+        :return: None
+        """
+        if not self.pending_writes:
+            return
+
+        now = time.monotonic()
+        if now - self.first_pending_at >= self.flush_seconds or now - self.last_write_at >= idle_seconds:
+            self.flush()
+
+    def close(self) -> None:
+        """
+        Flush the pending changes and close the wrapped storage.
+
+        :return: None
+        """
+        self.flush()
+        super().close()
@@ -0,0 +1,3 @@
+from .schema_migrations import RECORD_SCHEMAS_TABLE, SchemaMigrations  # isort:skip
+from .children_migrations import children_migrations  # isort:skip
+from .adults_migrations import adults_migrations  # isort:skip
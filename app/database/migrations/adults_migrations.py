@@ -0,0 +1,10 @@
+from app.database.migrations.schema_migrations import SchemaMigrations
+
+# Migrations of the adults records. To change their layout, register the function upgrading a record from the
+# previous version with the next version number, next to the new AdultEntity attribute:
+#
+#     @adults_migrations.register(2)
+#     def add_adult_nickname(document: Dict[str, Any]) -> None:
+#         document['adult_nickname'] = ''
+#
+adults_migrations = SchemaMigrations('adult_schema')
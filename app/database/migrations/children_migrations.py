@@ -0,0 +1,10 @@
+from app.database.migrations.schema_migrations import SchemaMigrations
+
+# Migrations of the children records. To change their layout, register the function upgrading a record from the
+# previous version with the next version number, next to the new ChildEntity attribute:
+#
+#     @children_migrations.register(2)
+#     def add_child_nickname(document: Dict[str, Any]) -> None:
+#         document['child_nickname'] = ''
+#
+children_migrations = SchemaMigrations('child_schema')
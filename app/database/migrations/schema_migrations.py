@@ -0,0 +1,82 @@
+from typing import Any, Callable, Dict, Set
+
+# Table holding the record schema version reached by every record of each table, in TinyDB and in SQLite.
+RECORD_SCHEMAS_TABLE = 'record_schemas'
+
+Migration = Callable[[Dict[str, Any]], None]
+
+
+class SchemaMigrations:
+    """
+    Class to keep the migration functions of the records of a table.
+
+    Each record stores the version of its layout under `attribute`. Records stored before versioning have version 1,
+    the first layout. The function registered for version N upgrades a record from version N - 1, in place, so adding
+    an entity attribute only needs a function giving it a value in the older records.
+
+    `upgrade` applies the missing migrations to a record. The repositories call it on every record they read and keep
+    the IDs of the records upgraded in memory but not saved yet in `pending`, to save them later in small batches.
+    `complete` tells that no stored record was found below the latest version, so they can stop looking for them.
+    """
+
+    BASE_VERSION = 1
+
+    def __init__(self, attribute: str) -> None:
+        """
+        Initialize the SchemaMigrations.
+
+        :param attribute: The record attribute holding the record schema version.
+        """
+        self.attribute = attribute
+        self.functions: Dict[int, Migration] = {}
+        self.latest = SchemaMigrations.BASE_VERSION
+        self.pending: Set[int] = set()
+        self.complete = False
+
+    def register(self, version: int) -> Callable[[Migration], Migration]:
+        """
+        Register the function upgrading the records to a version, as a decorator.
+
+        :param version: The version the function upgrades the records to. It must follow the latest version.
+
+        :return: The decorator registering the function.
+        """
+        if version != self.latest + 1:
+            raise ValueError(f'The next migration of {self.attribute} is version {self.latest + 1}, not {version}')
+
+        def decorator(function: Migration) -> Migration:
+            self.functions[version] = function
+            self.latest = version
+            self.complete = False
+            return function
+
+        return decorator
+
+    def version_of(self, document: Dict[str, Any]) -> int:
+        """
+        Get the record schema version of a record.
+
+        :param document: The stored record.
+
+        :return: The version of the record.
+        """
+        return document.get(self.attribute, SchemaMigrations.BASE_VERSION)
+
+    def upgrade(self, document: Dict[str, Any]) -> bool:
+        """
+        Upgrade a record to the latest version, in place.
+
+        :param document: The stored record.
+
+        :return: True if the record was upgraded, False if it already was at the latest version.
+        """
+        version = self.version_of(document)
+
+        if version >= self.latest:
+            return False
+
+        for next_version in range(version + 1, self.latest + 1):
+            self.functions[next_version](document)
+
+        document[self.attribute] = self.latest
+        return True
@@ -1,2 +1,12 @@
+from app import constants
+
+from .base_repository import BaseRepository  # isort:skip
 from .child_repository import ChildRepository  # isort:skip
 from .adult_repository import AdultRepository  # isort:skip
+from .sqlite_repository import SqliteRepository  # isort:skip
+from .sqlite_child_repository import SqliteChildRepository  # isort:skip
+from .sqlite_adult_repository import SqliteAdultRepository  # isort:skip
+
+if constants.DATABASE_BACKEND == 'sqlite':
+    ChildRepository = SqliteChildRepository  # noqa: F811
+    AdultRepository = SqliteAdultRepository  # noqa: F811
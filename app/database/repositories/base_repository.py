@@ -0,0 +1,725 @@
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Type
+
+from tinydb import TinyDB, where
+from tinydb.table import Document, Table
+
+from app.database.caches import EntityCache
+from app.database.connections import LocalConnection
+from app.database.entities import LazyRecord
+from app.database.errors import VersionConflictError
+from app.database.events import ChangeEvent, ChangeFeed
+from app.database.indexes import ActivityIndex, DateIndex, HashIndex, TrigramIndex
+from app.database.migrations import RECORD_SCHEMAS_TABLE, SchemaMigrations
+from app.utils.formats import format_date_to_age, format_without_accents, is_document_number
+
+REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+
+def page_doc_ids(doc_ids: Sequence[int], after_id: Optional[int], limit: int, newest_first: bool) -> Sequence[int]:
+    """
+    Slice a page out of sorted document IDs.
+
+    :param doc_ids: The document IDs in ascending order.
+    :param after_id: The last document ID of the previous page, or None for the first page.
+    :param limit: The maximum number of document IDs in the page.
+    :param newest_first: Whether the page goes from the highest document ID down.
+
+    :return: The document IDs of the page, in the page order.
+    """
+    if newest_first:
+        stop = len(doc_ids) if after_id is None else bisect_left(doc_ids, after_id)
+        return doc_ids[max(stop - limit, 0) : stop][::-1]
+
+    start = 0 if after_id is None else bisect_right(doc_ids, after_id)
+    return doc_ids[start : start + limit]
+
+
+def project(entities: Iterable[Any], fields: Optional[Sequence[str]]) -> List[Any]:
+    """
+    Project entities onto some of their attributes.
+
+    :param entities: The entities.
+    :param fields: The attributes to keep, or None to keep the entities.
+
+    :return: A list of entities, or of tuples holding the attributes in the fields order.
+    """
+    if fields is None:
+        return list(entities)
+
+    getter = attrgetter(*fields)
+
+    if len(fields) == 1:
+        return [(getter(entity),) for entity in entities]
+    return [getter(entity) for entity in entities]
+
+
+class BaseRepository:
+    """
+    A base class for managing the records of a database table.
+
+    Subclasses define the table name, the entity class and the entity attributes used by the shared operations.
+    Hydrated entities are kept in an EntityCache that the insert, update and delete operations patch in place, so
+    listing the records does not rebuild every entity on each call. The returned entities are shared and must be
+    treated as read-only.
+
+    The cache also maintains the indexes declared by the subclass: `document_index` maps the normalized CPF and RG
+    numbers to doc_ids and `search_index` is a trigram index over the search attributes, which also keeps their
+    accent-folded search keys. `activity_index` maps each activity to the doc_ids enrolled in it and `birthdate_index`
+    keeps the parsed birthdates sorted for range queries.
+
+    Every record stores a version under `version_attribute`, 1 when it is inserted and incremented by every update.
+    `update_one` can check it to refuse saving over changes made since the record was loaded.
+
+    Each write operation publishes its `ChangeEvent`s to the subscribers of `feed` once it is done, so views can patch
+    what they show instead of searching again.
+
+    Records are upgraded to the latest record schema of `migrations` when they are read, and when they are updated.
+    `save_upgrades` saves the records upgraded on read in small batches, so a new record schema does not need a full
+    rewrite of the database at startup.
+    """
+
+    table_name: str = ''
+    entity_class: Type = object
+    record_class: Type[LazyRecord] = LazyRecord
+    id_attribute: str = ''
+    version_attribute: str = ''
+    activities_attribute: str = ''
+    search_attributes: Tuple[str, ...] = ()
+    document_index: HashIndex
+    search_index: TrigramIndex
+    activity_index: ActivityIndex
+    birthdate_index: DateIndex
+    cache: EntityCache
+    feed: ChangeFeed
+    migrations: SchemaMigrations
+
+    @classmethod
+    def to_entity(cls, document: Document) -> Any:
+        """
+        Build an entity from a database document.
+
+        :param document: The database document. It is upgraded to the latest record schema on a copy.
+
+        :return: The entity, with its ID attribute set to the document ID and its version attribute set.
+        """
+        values = dict(document)
+
+        if cls.migrations.upgrade(values):
+            cls.migrations.pending.add(document.doc_id)
+
+        version = values.pop(cls.version_attribute, 0)
+        values.pop(cls.migrations.attribute, None)
+        entity = cls.entity_class(**values)
+        setattr(entity, cls.id_attribute, document.doc_id)
+        setattr(entity, cls.version_attribute, version)
+        return entity
+
+    @classmethod
+    def upgrade(cls, document: Document) -> Document:
+        """
+        Upgrade a database document to the latest record schema, in place.
+
+        :param document: The database document, a copy of the stored one.
+
+        :return: The same document.
+        """
+        if cls.migrations.upgrade(document):
+            cls.migrations.pending.add(document.doc_id)
+        return document
+
+    @classmethod
+    def load_cache(cls, database: TinyDB) -> EntityCache:
+        """
+        Get the entity cache, hydrating it from the table if it does not belong to the given database yet.
+
+        :param database: The TinyDB instance being used.
+
+        :return: The loaded entity cache.
+        """
+        if not cls.cache.is_loaded(database):
+            table = database.table(cls.table_name)
+            entities = {document.doc_id: cls.to_entity(document) for document in table.all()}
+            cls.cache.load(database, entities)
+
+        return cls.cache
+
+    @classmethod
+    def latest_schema(cls) -> Dict[str, int]:
+        """
+        Get the record schema attribute of the new records.
+
+        :return: A dictionary holding the latest record schema version under the record schema attribute.
+        """
+        return {cls.migrations.attribute: cls.migrations.latest}
+
+    @classmethod
+    def insert_one(cls, values: Dict[str, Any]) -> int:
+        """
+        Insert a single record into the database.
+
+        :param values: A dictionary containing the data for the record.
+
+        :return: The document ID of the inserted record.
+        """
+        with LocalConnection(write=True) as connection:
+            database = connection.database
+            table = database.table(cls.table_name)
+            document_id = table.insert({**values, cls.version_attribute: 1, **cls.latest_schema()})
+
+            if cls.cache.is_loaded(database):
+                cls.cache.put(document_id, cls.to_entity(table.get(doc_id=document_id)))
+
+        cls.feed.publish(ChangeEvent.INSERTED, cls.table_name, [document_id])
+        return document_id
+
+    @classmethod
+    def select_one(cls, doc_id: int) -> Optional[Any]:
+        """
+        Retrieve a single record by its ID.
+
+        :param doc_id: The ID of the record to retrieve.
+
+        :return: An entity representing the retrieved record, or None if not found.
+        """
+        with LocalConnection() as connection:
+            database = connection.database
+
+            if cls.cache.is_loaded(database):
+                return cls.cache.get(doc_id)
+
+            table = database.table(cls.table_name)
+            register = table.get(doc_id=doc_id)
+
+            if register is not None:
+                return cls.to_entity(register)
+
+            return None
+
+    @classmethod
+    def select_many(cls, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Retrieve every record from the database, newest first.
+
+        With `fields`, like `('child_id', 'child_name')`, each record is returned as a tuple holding only those
+        attributes, which is all a listing needs.
+
+        :param fields: The entity attributes to return instead of entities.
+
+        :return: A list of entities representing the retrieved records, or of tuples with the projected attributes.
+        """
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            return project(cache.newest_first(), fields)
+
+    @classmethod
+    def update_one(cls, doc_id: int, values: Dict[str, Any], expected_version: Optional[int] = None) -> int:
+        """
+        Update the data of a single record identified by its ID.
+
+        :param doc_id: The ID of the record to update.
+        :param values: A dictionary containing the updated data for the record.
+        :param expected_version: The version the record had when it was loaded. If given and the record was updated
+            since, VersionConflictError is raised and nothing is saved.
+
+        :return: The new version of the record.
+        """
+        with LocalConnection(write=True) as connection:
+            database = connection.database
+            table = database.table(cls.table_name)
+            document = table.get(doc_id=doc_id)
+
+            if document is None:
+                raise KeyError(doc_id)
+
+            version = document.get(cls.version_attribute, 0)
+            if expected_version is not None and version != expected_version:
+                raise VersionConflictError(doc_id, expected_version, version)
+
+            def perform_update(stored: Dict[str, Any]) -> None:
+                cls.migrations.upgrade(stored)
+                stored.update(values)
+                stored[cls.version_attribute] = version + 1
+
+            table.update(perform_update, doc_ids=[doc_id])
+            cls.migrations.pending.discard(doc_id)
+
+            if cls.cache.is_loaded(database):
+                cls.cache.put(doc_id, cls.to_entity(table.get(doc_id=doc_id)))
+
+        cls.feed.publish(ChangeEvent.UPDATED, cls.table_name, [doc_id])
+        return version + 1
+
+    @classmethod
+    def delete_one(cls, doc_id: int) -> None:
+        """
+        Delete a single record from the database by its ID.
+
+        :param doc_id: The ID of the record to delete.
+
+        :return: None
+        """
+        with LocalConnection(write=True) as connection:
+            database = connection.database
+            table = database.table(cls.table_name)
+            table.remove(doc_ids=[doc_id])
+
+            if cls.cache.is_loaded(database):
+                cls.cache.discard(doc_id)
+
+        cls.feed.publish(ChangeEvent.DELETED, cls.table_name, [doc_id])
+
+    @classmethod
+    def insert_many(cls, values: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Insert several records into the database with a single storage write.
+
+        :param values: The dictionaries containing the data for each record.
+
+        :return: The document IDs of the inserted records, in the given order.
+        """
+        with LocalConnection(write=True) as connection:
+            database = connection.database
+            table = database.table(cls.table_name)
+            schema = cls.latest_schema()
+            document_ids = table.insert_multiple({**record, cls.version_attribute: 1, **schema} for record in values)
+
+            if cls.cache.is_loaded(database):
+                for document_id in document_ids:
+                    cls.cache.put(document_id, cls.to_entity(table.get(doc_id=document_id)))
+
+        cls.feed.publish(ChangeEvent.INSERTED, cls.table_name, document_ids)
+        return document_ids
+
+    @classmethod
+    def select_doc_ids(
+        cls,
+        table: Table,
+        doc_ids: Optional[Iterable[int]],
+        predicate: Optional[Callable[[Mapping[str, Any]], bool]],
+    ) -> Optional[List[int]]:
+        """
+        Choose the records of a bulk operation before it changes any of them.
+
+        TinyDB changes the documents of the session in place while it updates or removes them. A missing ID or a
+        failing predicate met halfway would leave the earlier changes in the session, to be saved by the next write.
+
+        :param table: The TinyDB table.
+        :param doc_ids: The IDs of the chosen records.
+        :param predicate: A function returning True for the chosen records.
+
+        :return: The document IDs of the chosen records, or None when every record is chosen.
+
+        :raises KeyError: If a record of the given IDs does not exist.
+        """
+        if doc_ids is not None:
+            doc_ids = list(doc_ids)
+            for doc_id in doc_ids:
+                if not table.contains(doc_id=doc_id):
+                    raise KeyError(doc_id)
+            return doc_ids
+
+        if predicate is not None:
+            return [document.doc_id for document in table if predicate(document)]
+
+        return None
+
+    @classmethod
+    def update_many(
+        cls,
+        values: Dict[str, Any],
+        doc_ids: Optional[Iterable[int]] = None,
+        predicate: Optional[Callable[[Mapping[str, Any]], bool]] = None,
+    ) -> List[int]:
+        """
+        Update several records with a single storage write.
+
+        The records are chosen by their IDs or by a predicate called with each stored record. Without both, every
+        record is updated. The version of every updated record is incremented. The records are chosen before any of
+        them is changed, so nothing is updated when an ID is missing or the predicate fails, and the database is not
+        written when no record is chosen.
+
+        :param values: A dictionary containing the updated data, applied to every chosen record.
+        :param doc_ids: The IDs of the records to update.
+        :param predicate: A function returning True for the records to update.
+
+        :return: The document IDs of the updated records.
+
+        :raises KeyError: If a record of the given IDs does not exist.
+        """
+
+        def perform_update(document: Dict[str, Any]) -> None:
+            cls.migrations.upgrade(document)
+            document.update(values)
+            document[cls.version_attribute] = document.get(cls.version_attribute, 0) + 1
+
+        with LocalConnection(write=True) as connection:
+            database = connection.database
+            table = database.table(cls.table_name)
+            selected_ids = cls.select_doc_ids(table, doc_ids, predicate)
+            if selected_ids == []:
+                return []
+
+            document_ids = table.update(perform_update, doc_ids=selected_ids)
+            cls.migrations.pending.difference_update(document_ids)
+
+            if cls.cache.is_loaded(database):
+                for document_id in document_ids:
+                    cls.cache.put(document_id, cls.to_entity(table.get(doc_id=document_id)))
+
+        cls.feed.publish(ChangeEvent.UPDATED, cls.table_name, document_ids)
+        return document_ids
+
+    @classmethod
+    def delete_many(
+        cls,
+        doc_ids: Optional[Iterable[int]] = None,
+        predicate: Optional[Callable[[Mapping[str, Any]], bool]] = None,
+    ) -> List[int]:
+        """
+        Delete several records with a single storage write.
+
+        The records are chosen by their IDs or by a predicate called with each stored record. One of them is
+        required. As in `update_many`, nothing is deleted when an ID is missing or the predicate fails, and the
+        database is not written when no record is chosen.
+
+        :param doc_ids: The IDs of the records to delete.
+        :param predicate: A function returning True for the records to delete.
+
+        :return: The document IDs of the deleted records.
+
+        :raises KeyError: If a record of the given IDs does not exist.
+        """
+        if doc_ids is None and predicate is None:
+            raise ValueError('delete_many needs doc_ids or a predicate')
+
+        with LocalConnection(write=True) as connection:
+            database = connection.database
+            table = database.table(cls.table_name)
+            selected_ids = cls.select_doc_ids(table, doc_ids, predicate)
+            if selected_ids == []:
+                return []
+
+            document_ids = table.remove(doc_ids=selected_ids)
+
+            if cls.cache.is_loaded(database):
+                for document_id in document_ids:
+                    cls.cache.discard(document_id)
+
+        cls.feed.publish(ChangeEvent.DELETED, cls.table_name, document_ids)
+        return document_ids
+
+    @classmethod
+    def save_upgrades(cls, limit: int) -> int:
+        """
+        Save a batch of the records upgraded to the latest record schema in memory.
+
+        When none is pending and the table is not known to be at the latest record schema, the stored records below it
+        are looked for. When none is found, the latest version is recorded for the table in the record schemas table
+        and nothing is looked for again. Saving an upgrade does not change the record version, so it never makes a
+        form conflict.
+
+        :param limit: The maximum number of records saved.
+
+        :return: The number of records saved.
+        """
+        migrations = cls.migrations
+
+        if migrations.complete and not migrations.pending:
+            return 0
+
+        with LocalConnection(write=True) as connection:
+            database = connection.database
+            table = database.table(cls.table_name)
+
+            if not migrations.pending:
+                schemas = database.table(RECORD_SCHEMAS_TABLE)
+                stored = schemas.get(where('table') == cls.table_name)
+                version = SchemaMigrations.BASE_VERSION if stored is None else stored['version']
+
+                if version < migrations.latest:
+                    migrations.pending.update(
+                        document.doc_id for document in table if migrations.version_of(document) < migrations.latest
+                    )
+
+                if not migrations.pending:
+                    if version < migrations.latest:
+                        values = {'table': cls.table_name, 'version': migrations.latest}
+                        schemas.upsert(values, where('table') == cls.table_name)
+                    migrations.complete = True
+                    return 0
+
+            batch = sorted(migrations.pending)[:limit]
+            migrations.pending.difference_update(batch)
+            doc_ids = [doc_id for doc_id in batch if table.contains(doc_id=doc_id)]
+            table.update(migrations.upgrade, doc_ids=doc_ids)
+            return len(doc_ids)
+
+    @classmethod
+    def order_by_activities(cls) -> Dict[str, List[Any]]:
+        """
+        Order registers by activities.
+
+        :return: A dictionary with activities as keys and lists of registers as values. The 'geral' key holds every
+            register and the activities follow in alphabetical order. Registers are listed newest first.
+        """
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            result = {'geral': list(cache.newest_first())}
+
+            for activity in sorted(cls.activity_index.activities):
+                doc_ids = cls.activity_index.find(activity)
+                result[activity] = [cache.get(doc_id) for doc_id in sorted(doc_ids, reverse=True)]
+
+            return result
+
+    @classmethod
+    def get_activities(cls) -> Set[str]:
+        """
+        Get unique activities.
+
+        :return: A set containing unique activities.
+        """
+        with LocalConnection() as connection:
+            cls.load_cache(connection.database)
+            return set(cls.activity_index.activities)
+
+    @classmethod
+    def count_by_activities(cls) -> Dict[str, int]:
+        """
+        Count the registers enrolled in each activity.
+
+        :return: A dictionary with activities as keys and the number of registers as values.
+        """
+        with LocalConnection() as connection:
+            cls.load_cache(connection.database)
+            return cls.activity_index.counts()
+
+    @classmethod
+    def select_by_birthdate_range(cls, start: date, end: date) -> List[Any]:
+        """
+        Retrieve the records born between two dates, both inclusive.
+
+        :param start: The first birthdate of the range.
+        :param end: The last birthdate of the range.
+
+        :return: A list of entities, newest first.
+        """
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            doc_ids = [doc_id for _birthdate, doc_id in cls.birthdate_index.between(start, end)]
+            return [cache.get(doc_id) for doc_id in sorted(doc_ids, reverse=True)]
+
+    @classmethod
+    def select_by_age_range(cls, min_age: int, max_age: int) -> List[Any]:
+        """
+        Retrieve the records whose age is between two ages, both inclusive.
+
+        :param min_age: The minimum age.
+        :param max_age: The maximum age.
+
+        :return: A list of entities, newest first.
+        """
+        today = date.today()
+        start = date(today.year - max_age - 1, 1, 1)
+        end = date(today.year - min_age, 12, 31)
+
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            doc_ids = [
+                doc_id
+                for birthdate, doc_id in cls.birthdate_index.between(start, end)
+                if min_age <= format_date_to_age(birthdate, today) <= max_age
+            ]
+            return [cache.get(doc_id) for doc_id in sorted(doc_ids, reverse=True)]
+
+    @classmethod
+    def select_without_birthdate(cls) -> List[Any]:
+        """
+        Retrieve the records whose birthdate is empty or could not be parsed.
+
+        :return: A list of entities, newest first.
+        """
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            return [cache.get(doc_id) for doc_id in sorted(cls.birthdate_index.unparsed, reverse=True)]
+
+    @classmethod
+    def find_by_document(cls, number: str, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Find the records holding a document number (CPF, RG), ignoring punctuation and case.
+
+        :param number: The document number.
+        :param fields: The entity attributes to return instead of entities, see `select_many`.
+
+        :return: A list of entities holding the document number, newest first.
+        """
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            doc_ids = cls.document_index.find(number)
+            return project((cache.get(doc_id) for doc_id in sorted(doc_ids, reverse=True)), fields)
+
+    @classmethod
+    def search_doc_ids(cls, searched: str) -> Optional[Set[int]]:
+        """
+        Find the document IDs matching a search query, see `search_many`. The entity cache must be loaded.
+
+        :param searched: The search query.
+
+        :return: The matching document IDs, in no particular order, or None when the query matches every record.
+        """
+        if is_document_number(searched):
+            doc_ids = cls.document_index.find(searched)
+            if doc_ids:
+                return doc_ids
+
+        if not searched:
+            return None
+
+        if REGEX_SPECIAL_CHARACTERS.isdisjoint(searched):
+            return cls.search_index.search(searched)
+
+        pattern = re.compile(format_without_accents(searched), flags=re.IGNORECASE)
+        return {doc_id for doc_id, keys in cls.search_index.keys.items() if any(pattern.match(key) for key in keys)}
+
+    @classmethod
+    def search_many(cls, searched: str, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Search for multiple records based on a search query.
+
+        When the query looks like a complete document number and some record holds it, the document index answers
+        without scanning the table. A plain text query matches the records containing it in any of the search
+        attributes, and is answered by the trigram index from three characters on. A query with regular expression
+        characters is matched against the start of the search attributes. Both ignore case and accents, so "joao" finds
+        "João".
+
+        :param searched: The search query used to find matching records.
+        :param fields: The entity attributes to return instead of entities, see `select_many`.
+
+        :return: A list of entities matching the search query, newest first, or of tuples with the projected
+            attributes.
+        """
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            doc_ids = cls.search_doc_ids(searched)
+
+            if doc_ids is None:
+                return project(cache.newest_first(), fields)
+
+            return project((cache.get(doc_id) for doc_id in sorted(doc_ids, reverse=True)), fields)
+
+    @classmethod
+    def search_among(cls, searched: str, doc_ids: Iterable[int], fields: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Search for a search query among some records, like `search_many` does among all of them.
+
+        It is used to patch a listing after a change, with the document IDs of the changed records.
+
+        :param searched: The search query used to find matching records.
+        :param doc_ids: The IDs of the records to search among. IDs of missing records are ignored.
+        :param fields: The entity attributes to return instead of entities, see `select_many`.
+
+        :return: A list of entities matching the search query, newest first, or of tuples with the projected
+            attributes.
+        """
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            matched = cls.search_doc_ids(searched)
+            chosen = [
+                doc_id
+                for doc_id in sorted(set(doc_ids), reverse=True)
+                if doc_id in cache.entities and (matched is None or doc_id in matched)
+            ]
+            return project((cache.get(doc_id) for doc_id in chosen), fields)
+
+    @classmethod
+    def select_page(cls, after_id: Optional[int] = None, limit: int = 100, newest_first: bool = True) -> List[Any]:
+        """
+        Retrieve a page of records ordered by ID.
+
+        Pass the ID of the last record of a page as `after_id` to get the next page. Pages stay consistent when
+        records are inserted or deleted between calls, and each call only touches the records of its page.
+
+        :param after_id: The ID of the last record of the previous page, or None for the first page.
+        :param limit: The maximum number of records in the page.
+        :param newest_first: Whether the records go from the newest to the oldest.
+
+        :return: A list of entities, empty after the last page.
+        """
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            return [cache.get(doc_id) for doc_id in page_doc_ids(cache.doc_ids(), after_id, limit, newest_first)]
+
+    @classmethod
+    def search_page(
+        cls,
+        searched: str,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        newest_first: bool = True,
+    ) -> List[Any]:
+        """
+        Retrieve a page of the records matching a search query, ordered by ID.
+
+        The query is handled as in `search_many` and the pages as in `select_page`.
+
+        :param searched: The search query used to find matching records.
+        :param after_id: The ID of the last record of the previous page, or None for the first page.
+        :param limit: The maximum number of records in the page.
+        :param newest_first: Whether the records go from the newest to the oldest.
+
+        :return: A list of entities, empty after the last page.
+        """
+        with LocalConnection() as connection:
+            cache = cls.load_cache(connection.database)
+            doc_ids = cls.search_doc_ids(searched)
+            doc_ids = cache.doc_ids() if doc_ids is None else sorted(doc_ids)
+            return [cache.get(doc_id) for doc_id in page_doc_ids(doc_ids, after_id, limit, newest_first)]
+
+    @classmethod
+    def iter_all(cls, raw: bool = False) -> Iterator[Any]:
+        """
+        Iterate over every record, oldest first, without building a list of them.
+
+        Cached entities are reused. Otherwise the documents are wrapped in lazy records as they are consumed and the
+        cache is left unloaded, so a single pass over the table builds no entity.
+
+        :param raw: Whether to yield the stored TinyDB documents instead of entities or records.
+
+        :return: An iterator over entities, records or documents.
+        """
+        with LocalConnection() as connection:
+            database = connection.database
+
+            if not raw and cls.cache.is_loaded(database):
+                cache = cls.cache
+                for doc_id in cache.doc_ids():
+                    yield cache.get(doc_id)
+                return
+
+            for document in database.table(cls.table_name):
+                cls.upgrade(document)
+                yield document if raw else cls.record_class(document, document.doc_id)
+
+    @classmethod
+    def iter_search(cls, searched: str, raw: bool = False) -> Iterator[Any]:
+        """
+        Iterate over the records matching a search query, as in `search_many`, oldest first.
+
+        :param searched: The search query used to find matching records.
+        :param raw: Whether to yield the stored TinyDB documents instead of entities.
+
+        :return: An iterator over entities or documents.
+        """
+        with LocalConnection() as connection:
+            database = connection.database
+            cache = cls.load_cache(database)
+            doc_ids = cls.search_doc_ids(searched)
+            doc_ids = cache.doc_ids() if doc_ids is None else sorted(doc_ids)
+            table = database.table(cls.table_name)
+
+            for doc_id in doc_ids:
+                yield cls.upgrade(table.get(doc_id=doc_id)) if raw else cache.get(doc_id)
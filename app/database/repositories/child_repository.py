@@ -1,164 +1,31 @@
-import re
-from collections import defaultdict
-from typing import Any, Dict, List, Optional, Set
+from app.database.caches import EntityCache
+from app.database.entities import ChildEntity, ChildRecord
+from app.database.events import ChangeFeed
+from app.database.indexes import ActivityIndex, DateIndex, HashIndex, TrigramIndex
+from app.database.migrations import children_migrations
+from app.database.repositories.base_repository import BaseRepository
+from app.utils.formats import format_document_number
 
-from tinydb import Query
 
-from app.database.connections import LocalConnection
-from app.database.entities import ChildEntity
-
-
-class ChildRepository:
+class ChildRepository(BaseRepository):
     """
     A class for managing child records in a database.
 
-    This class provides methods to perform various operations on adult records, including insertion, retrieval, update,
+    This class provides methods to perform various operations on child records, including insertion, retrieval, update,
     and deletion.
     """
 
-    @staticmethod
-    def insert_one(values: Dict[str, Any]) -> int:
-        """
-        Insert a single child record into the database.
-
-        :param values: A dictionary containing the data for the child record.
-
-        :return: The document ID of the inserted record.
-        """
-        with LocalConnection() as connection:
-            database = connection.database
-            table = database.table('children')
-            document_id = table.insert(values)
-
-            return document_id
-
-    @staticmethod
-    def select_one(child_id: int) -> Optional[ChildEntity]:
-        """
-        Retrieve a single adult record by its ID.
-
-        :param child_id: The ID of the adult record to retrieve.
-
-        :return: An ChildEntity representing the retrieved record, or None if not found.
-        """
-        with LocalConnection() as connection:
-            database = connection.database
-            table = database.table('children')
-            register = table.get(doc_id=child_id)
-
-            if register is not None:
-                child_entity = ChildEntity(**register)
-                child_entity.child_id = register.doc_id
-                return child_entity
-
-            return None
-
-    @staticmethod
-    def select_many() -> List[ChildEntity]:
-        """
-        Retrieve multiple child records from the database.
-
-        :return: A list of ChildEntity objects representing the retrieved records.
-        """
-        registers = []
-
-        with LocalConnection() as connection:
-            database = connection.database
-            table = database.table('children')
-
-            for register in table.all():
-                child = ChildEntity(**register)
-                child.child_id = register.doc_id
-                registers.append(child)
-
-        return registers[::-1]
-
-    @staticmethod
-    def update_one(child_id: int, values: Dict[str, Any]) -> None:
-        """
-        Update the data of a single child record identified by its ID.
-
-        :param child_id: The ID of the adult record to update.
-
-        :param values: A dictionary containing the updated data for the child record.
-
-        :return: None
-        """
-        with LocalConnection() as connection:
-            database = connection.database
-            table = database.table('children')
-            table.update(values, doc_ids=[child_id])
-
-    @staticmethod
-    def delete_one(child_id: int) -> None:
-        """
-        Delete a single child record from the database by its ID.
-
-        :param child_id: The ID of the adult record to delete.
-
-        :return: None
-        """
-        with LocalConnection() as connection:
-            database = connection.database
-            table = database.table('children')
-            table.remove(doc_ids=[child_id])
-
-    @staticmethod
-    def order_by_activities() -> Dict[str, List[ChildEntity]]:
-        """
-        Order child registers by activities.
-
-        :return: A dictionary with activities as keys and lists of child registers as values.
-        """
-        registers = ChildRepository.select_many()
-        result = defaultdict(list)
-
-        for register in registers:
-            result['geral'].append(register)
-            for activity in register.child_activities:
-                result[activity].append(register)
-
-        return dict(result)
-
-    @staticmethod
-    def get_activities() -> Set[str]:
-        """
-        Get unique child activities.
-
-        :return: A set containing unique child activities.
-        """
-        activities = set()
-
-        for register in ChildRepository.select_many():
-            activities.update(register.child_activities)
-
-        return activities
-
-    @staticmethod
-    def search_many(searched: str) -> List[ChildEntity]:
-        """
-        Search for multiple child records based on a search query.
-
-        :param searched:The search query used to find matching child records.
-
-        :return:  list of ChildEntity objects matching the search query.
-        """
-        registers = []
-        query = Query()
-
-        with LocalConnection() as connection:
-            database = connection.database
-            table = database.table('children')
-
-            documents = table.search(
-                (query.child_name.matches(searched, flags=re.IGNORECASE))
-                | (query.child_cpf.matches(searched, flags=re.IGNORECASE))
-                | (query.child_rg.matches(searched, flags=re.IGNORECASE))
-            )
-
-            for document in documents:
-                child = ChildEntity(**document)
-                child.child_id = document.doc_id
-                registers.append(child)
-
-        return registers[::-1]
+    table_name = 'children'
+    entity_class = ChildEntity
+    record_class = ChildRecord
+    id_attribute = 'child_id'
+    version_attribute = 'child_version'
+    activities_attribute = 'child_activities'
+    search_attributes = ('child_name', 'child_cpf', 'child_rg')
+    document_index = HashIndex(('child_cpf', 'child_rg', 'parent_cpf'), format_document_number)
+    search_index = TrigramIndex(search_attributes)
+    activity_index = ActivityIndex(activities_attribute)
+    birthdate_index = DateIndex('child_birthdate')
+    cache = EntityCache(indexes=[document_index, search_index, activity_index, birthdate_index])
+    feed = ChangeFeed()
+    migrations = children_migrations
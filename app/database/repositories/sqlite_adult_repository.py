@@ -0,0 +1,24 @@
+from app.database.entities import AdultEntity, AdultRecord
+from app.database.events import ChangeFeed
+from app.database.migrations import adults_migrations
+from app.database.repositories.sqlite_repository import SqliteRepository
+
+
+class SqliteAdultRepository(SqliteRepository):
+    """
+    A class for managing adult records in the SQLite database.
+
+    This class provides the same operations as AdultRepository, stored in the 'adults' SQLite table.
+    """
+
+    table_name = 'adults'
+    entity_class = AdultEntity
+    record_class = AdultRecord
+    id_attribute = 'adult_id'
+    version_attribute = 'adult_version'
+    activities_attribute = 'adult_activities'
+    search_attributes = ('adult_name', 'adult_cpf', 'adult_rg')
+    document_attributes = ('adult_cpf', 'adult_rg')
+    birthdate_attribute = 'adult_birthdate'
+    feed = ChangeFeed()
+    migrations = adults_migrations
@@ -0,0 +1,24 @@
+from app.database.entities import ChildEntity, ChildRecord
+from app.database.events import ChangeFeed
+from app.database.migrations import children_migrations
+from app.database.repositories.sqlite_repository import SqliteRepository
+
+
+class SqliteChildRepository(SqliteRepository):
+    """
+    A class for managing child records in the SQLite database.
+
+    This class provides the same operations as ChildRepository, stored in the 'children' SQLite table.
+    """
+
+    table_name = 'children'
+    entity_class = ChildEntity
+    record_class = ChildRecord
+    id_attribute = 'child_id'
+    version_attribute = 'child_version'
+    activities_attribute = 'child_activities'
+    search_attributes = ('child_name', 'child_cpf', 'child_rg')
+    document_attributes = ('child_cpf', 'child_rg', 'parent_cpf')
+    birthdate_attribute = 'child_birthdate'
+    feed = ChangeFeed()
+    migrations = children_migrations
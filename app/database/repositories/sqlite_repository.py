@@ -0,0 +1,853 @@
+import json
+import re
+import sqlite3
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Type
+
+from tinydb.table import Document
+
+from app import constants
+from app.database.connections import SqliteConnection
+from app.database.entities import LazyRecord
+from app.database.errors import VersionConflictError
+from app.database.events import ChangeEvent, ChangeFeed
+from app.database.migrations import RECORD_SCHEMAS_TABLE, SchemaMigrations
+from app.utils import formats
+
+
+def full_text_query(searched: str) -> Optional[str]:
+    """
+    Build the FTS5 query matching the records where every word of a search starts a word.
+
+    :param searched: The search query.
+
+    :return: The FTS5 query, or None if the search has no word.
+    """
+    words = re.findall(r'\w+', formats.format_search_key(searched))
+    return ' '.join(f'"{word}"*' for word in words) if words else None
+
+
+def like_pattern(searched: str) -> str:
+    """
+    Build the LIKE pattern matching the search keys containing a search, to be used with ESCAPE '\\'.
+
+    :param searched: The search query.
+
+    :return: The LIKE pattern.
+    """
+    return '%' + re.sub(r'([\\%_])', r'\\\1', formats.format_search_key(searched)) + '%'
+
+
+class SqliteRepository:
+    """
+    A base class for managing the records of a SQLite table.
+
+    It offers the same operations as `BaseRepository`, answered by SQL instead of in-memory indexes. Each record is
+    stored as a JSON document, with the doc_id as primary key, next to indexed columns holding its search key and
+    birthdate, and side tables holding its normalized document numbers and its activities. Those derived values are
+    written in the same transaction as the record. The full-text table is kept in sync by triggers.
+
+    Listings return `LazyRecord` views over the parsed documents, so no entity is built until `to_entity` is called
+    on one of them. `select_one` returns the full entity.
+
+    Subclasses define the table name, the entity and record classes and the entity attributes used by the shared
+    operations. Like `BaseRepository`, each write operation publishes its `ChangeEvent`s to `feed` once committed.
+
+    Records are upgraded to the latest record schema when they are read and updated, and `save_upgrades` saves them in
+    batches, as in `BaseRepository`. Projections read the stored JSON, so until a record is saved they show the
+    projected attributes of its stored record schema.
+    """
+
+    table_name: str = ''
+    entity_class: Type = object
+    record_class: Type[LazyRecord] = LazyRecord
+    id_attribute: str = ''
+    version_attribute: str = ''
+    activities_attribute: str = ''
+    search_attributes: Tuple[str, ...] = ()
+    document_attributes: Tuple[str, ...] = ()
+    birthdate_attribute: str = ''
+    feed: ChangeFeed
+    migrations: SchemaMigrations
+
+    @classmethod
+    def to_entity(cls, doc_id: int, document: str) -> Any:
+        """
+        Build an entity from a stored JSON document.
+
+        :param doc_id: The document ID.
+        :param document: The JSON document.
+
+        :return: The entity, with its ID attribute set to the document ID and its version attribute set.
+        """
+        values = cls.load_document(doc_id, document)
+        version = values.pop(cls.version_attribute, 0)
+        values.pop(cls.migrations.attribute, None)
+        entity = cls.entity_class(**values)
+        setattr(entity, cls.id_attribute, doc_id)
+        setattr(entity, cls.version_attribute, version)
+        return entity
+
+    @classmethod
+    def load_document(cls, doc_id: int, document: str) -> Dict[str, Any]:
+        """
+        Parse a stored JSON document and upgrade it to the latest record schema.
+
+        :param doc_id: The document ID.
+        :param document: The stored JSON document.
+
+        :return: The parsed document.
+        """
+        values = json.loads(document)
+
+        if cls.migrations.upgrade(values):
+            cls.migrations.pending.add(doc_id)
+
+        return values
+
+    @classmethod
+    def latest_schema(cls) -> Dict[str, int]:
+        """
+        Get the record schema attribute of the new records.
+
+        :return: A dictionary holding the latest record schema version under the record schema attribute.
+        """
+        return {cls.migrations.attribute: cls.migrations.latest}
+
+    @classmethod
+    def columns(cls, fields: Optional[Sequence[str]], table: str = '') -> str:
+        """
+        Build the SQL select list of a query, for records or for a projection.
+
+        :param fields: The projected entity attributes, or None to select the doc_id and the document.
+        :param table: The table name or alias qualifying the columns, defaults to the records table.
+
+        :return: The select list.
+        """
+        table = table or cls.table_name
+
+        if fields is None:
+            return f'{table}.doc_id, {table}.document'
+
+        values = []
+        for field in fields:
+            if not field.isidentifier():
+                raise ValueError(f'Invalid field: {field!r}')
+            if field == cls.id_attribute:
+                values.append(f'{table}.doc_id')
+            elif field == cls.version_attribute:
+                values.append(f"coalesce(json_extract({table}.document, '$.{field}'), 0)")
+            else:
+                values.append(f"json_extract({table}.document, '$.{field}')")
+
+        return f'json_array({", ".join(values)})'
+
+    @classmethod
+    def to_results(cls, rows: List[Tuple[Any, ...]], fields: Optional[Sequence[str]]) -> List[Any]:
+        """
+        Convert the rows selected with `columns`.
+
+        :param rows: The rows.
+        :param fields: The projected entity attributes, or None for records.
+
+        :return: A list of records, or of tuples holding the projected attributes, in the rows order.
+        """
+        if fields is None:
+            return cls.to_records(rows)
+        return [tuple(json.loads(values)) for values, in rows]
+
+    @classmethod
+    def to_records(cls, rows: List[Tuple[int, str]]) -> List[LazyRecord]:
+        """
+        Build lazy records from (doc_id, document) rows.
+
+        :param rows: The rows.
+
+        :return: A list of records, in the rows order.
+        """
+        record_class = cls.record_class
+        return [record_class(cls.load_document(doc_id, document), doc_id) for doc_id, document in rows]
+
+    @classmethod
+    def write_document(cls, database: sqlite3.Connection, doc_id: Optional[int], values: Dict[str, Any]) -> int:
+        """
+        Insert or replace a record and its derived columns and rows.
+
+        :param database: The sqlite3 connection.
+        :param doc_id: The document ID to write, or None to use the next one.
+        :param values: The complete record.
+
+        :return: The document ID of the written record.
+        """
+        search_key = '\n'.join(
+            formats.format_search_key(values.get(attribute, '')) for attribute in cls.search_attributes
+        )
+        birthdate = formats.format_str_to_date(values.get(cls.birthdate_attribute, ''))
+        birthdate = birthdate.isoformat() if isinstance(birthdate, date) else None
+
+        cursor = database.execute(
+            f'INSERT INTO {cls.table_name} (doc_id, search_key, birthdate, document) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (doc_id) DO UPDATE SET '
+            'search_key = excluded.search_key, birthdate = excluded.birthdate, document = excluded.document',
+            (doc_id, search_key, birthdate, json.dumps(values)),
+        )
+        doc_id = cursor.lastrowid if doc_id is None else doc_id
+
+        numbers = {formats.format_document_number(values.get(attribute, '')) for attribute in cls.document_attributes}
+        numbers.discard('')
+        database.execute(f'DELETE FROM {cls.table_name}_documents WHERE doc_id = ?', (doc_id,))
+        database.executemany(
+            f'INSERT INTO {cls.table_name}_documents (number, doc_id) VALUES (?, ?)',
+            [(number, doc_id) for number in numbers],
+        )
+
+        activities = set(values.get(cls.activities_attribute, ()))
+        database.execute(f'DELETE FROM {cls.table_name}_activities WHERE doc_id = ?', (doc_id,))
+        database.executemany(
+            f'INSERT INTO {cls.table_name}_activities (activity, doc_id) VALUES (?, ?)',
+            [(activity, doc_id) for activity in activities],
+        )
+
+        return doc_id
+
+    @classmethod
+    def insert_one(cls, values: Dict[str, Any]) -> int:
+        """
+        Insert a single record into the database.
+
+        :param values: A dictionary containing the data for the record.
+
+        :return: The document ID of the inserted record.
+        """
+        with SqliteConnection() as connection:
+            document = {**values, cls.version_attribute: 1, **cls.latest_schema()}
+            document_id = cls.write_document(connection.database, None, document)
+
+        cls.feed.publish(ChangeEvent.INSERTED, cls.table_name, [document_id])
+        return document_id
+
+    @classmethod
+    def select_one(cls, doc_id: int) -> Optional[Any]:
+        """
+        Retrieve a single record by its ID.
+
+        :param doc_id: The ID of the record to retrieve.
+
+        :return: An entity representing the retrieved record, or None if not found.
+        """
+        with SqliteConnection() as connection:
+            row = connection.database.execute(
+                f'SELECT doc_id, document FROM {cls.table_name} WHERE doc_id = ?', (doc_id,)
+            ).fetchone()
+
+            if row is not None:
+                return cls.to_entity(*row)
+
+            return None
+
+    @classmethod
+    def select_many(cls, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Retrieve every record from the database, newest first.
+
+        :param fields: The entity attributes to return instead of records, see `BaseRepository.select_many`.
+
+        :return: A list of records, or of tuples with the projected attributes.
+        """
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT {cls.columns(fields)} FROM {cls.table_name} ORDER BY doc_id DESC'
+            ).fetchall()
+            return cls.to_results(rows, fields)
+
+    @classmethod
+    def update_one(cls, doc_id: int, values: Dict[str, Any], expected_version: Optional[int] = None) -> int:
+        """
+        Update the data of a single record identified by its ID.
+
+        :param doc_id: The ID of the record to update.
+        :param values: A dictionary containing the updated data for the record.
+        :param expected_version: The version the record had when it was loaded. If given and the record was updated
+            since, VersionConflictError is raised and nothing is saved.
+
+        :return: The new version of the record.
+        """
+        with SqliteConnection() as connection:
+            database = connection.database
+            # Take the write lock before reading, so the version can not change until the commit.
+            database.execute(f'UPDATE {cls.table_name} SET search_key = search_key WHERE doc_id = ?', (doc_id,))
+            row = database.execute(f'SELECT document FROM {cls.table_name} WHERE doc_id = ?', (doc_id,)).fetchone()
+
+            if row is None:
+                raise KeyError(doc_id)
+
+            document = json.loads(row[0])
+            version = document.get(cls.version_attribute, 0)
+            if expected_version is not None and version != expected_version:
+                raise VersionConflictError(doc_id, expected_version, version)
+
+            cls.migrations.upgrade(document)
+            document.update(values)
+            document[cls.version_attribute] = version + 1
+            cls.write_document(database, doc_id, document)
+            cls.migrations.pending.discard(doc_id)
+
+        cls.feed.publish(ChangeEvent.UPDATED, cls.table_name, [doc_id])
+        return version + 1
+
+    @classmethod
+    def delete_one(cls, doc_id: int) -> None:
+        """
+        Delete a single record from the database by its ID.
+
+        :param doc_id: The ID of the record to delete.
+
+        :return: None
+        """
+        with SqliteConnection() as connection:
+            cursor = connection.database.execute(f'DELETE FROM {cls.table_name} WHERE doc_id = ?', (doc_id,))
+
+        if cursor.rowcount:
+            cls.feed.publish(ChangeEvent.DELETED, cls.table_name, [doc_id])
+
+    @classmethod
+    def select_documents(
+        cls,
+        database: sqlite3.Connection,
+        doc_ids: Optional[Iterable[int]],
+        predicate: Optional[Callable[[Mapping[str, Any]], bool]],
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Read the stored records chosen by their IDs or by a predicate.
+
+        :param database: The sqlite3 connection.
+        :param doc_ids: The IDs of the records, every one of them must exist.
+        :param predicate: A function returning True for the chosen records.
+
+        :return: The chosen records keyed by doc_id. Without IDs and predicate, every record.
+        """
+        if doc_ids is not None:
+            documents = {}
+            for doc_id in doc_ids:
+                row = database.execute(f'SELECT document FROM {cls.table_name} WHERE doc_id = ?', (doc_id,)).fetchone()
+
+                if row is None:
+                    raise KeyError(doc_id)
+
+                documents[doc_id] = json.loads(row[0])
+            return documents
+
+        rows = database.execute(f'SELECT doc_id, document FROM {cls.table_name} ORDER BY doc_id')
+        documents = {doc_id: json.loads(document) for doc_id, document in rows}
+
+        if predicate is not None:
+            documents = {doc_id: document for doc_id, document in documents.items() if predicate(document)}
+
+        return documents
+
+    @classmethod
+    def insert_many(cls, values: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Insert several records into the database in a single transaction.
+
+        :param values: The dictionaries containing the data for each record.
+
+        :return: The document IDs of the inserted records, in the given order.
+        """
+        with SqliteConnection() as connection:
+            schema = cls.latest_schema()
+            document_ids = [
+                cls.write_document(connection.database, None, {**record, cls.version_attribute: 1, **schema})
+                for record in values
+            ]
+
+        cls.feed.publish(ChangeEvent.INSERTED, cls.table_name, document_ids)
+        return document_ids
+
+    @classmethod
+    def update_many(
+        cls,
+        values: Dict[str, Any],
+        doc_ids: Optional[Iterable[int]] = None,
+        predicate: Optional[Callable[[Mapping[str, Any]], bool]] = None,
+    ) -> List[int]:
+        """
+        Update several records in a single transaction.
+
+        The records are chosen by their IDs or by a predicate called with each stored record. Without both, every
+        record is updated. The version of every updated record is incremented.
+
+        :param values: A dictionary containing the updated data, applied to every chosen record.
+        :param doc_ids: The IDs of the records to update.
+        :param predicate: A function returning True for the records to update.
+
+        :return: The document IDs of the updated records.
+        """
+        with SqliteConnection() as connection:
+            database = connection.database
+            documents = cls.select_documents(database, doc_ids, predicate)
+
+            for doc_id, document in documents.items():
+                cls.migrations.upgrade(document)
+                document.update(values)
+                document[cls.version_attribute] = document.get(cls.version_attribute, 0) + 1
+                cls.write_document(database, doc_id, document)
+
+            cls.migrations.pending.difference_update(documents)
+
+        cls.feed.publish(ChangeEvent.UPDATED, cls.table_name, list(documents))
+        return list(documents)
+
+    @classmethod
+    def delete_many(
+        cls,
+        doc_ids: Optional[Iterable[int]] = None,
+        predicate: Optional[Callable[[Mapping[str, Any]], bool]] = None,
+    ) -> List[int]:
+        """
+        Delete several records in a single transaction.
+
+        The records are chosen by their IDs or by a predicate called with each stored record. One of them is
+        required.
+
+        :param doc_ids: The IDs of the records to delete.
+        :param predicate: A function returning True for the records to delete.
+
+        :return: The document IDs of the deleted records.
+        """
+        if doc_ids is None and predicate is None:
+            raise ValueError('delete_many needs doc_ids or a predicate')
+
+        with SqliteConnection() as connection:
+            database = connection.database
+            document_ids = list(cls.select_documents(database, doc_ids, predicate))
+            database.executemany(
+                f'DELETE FROM {cls.table_name} WHERE doc_id = ?', [(doc_id,) for doc_id in document_ids]
+            )
+
+        cls.feed.publish(ChangeEvent.DELETED, cls.table_name, document_ids)
+        return document_ids
+
+    @classmethod
+    def save_upgrades(cls, limit: int) -> int:
+        """
+        Save a batch of the records upgraded to the latest record schema, see `BaseRepository.save_upgrades`.
+
+        Records below the latest record schema are looked for `limit` at a time, so they are all upgraded and saved
+        even if they are never read.
+
+        :param limit: The maximum number of records saved.
+
+        :return: The number of records saved.
+        """
+        migrations = cls.migrations
+
+        if migrations.complete and not migrations.pending:
+            return 0
+
+        with SqliteConnection() as connection:
+            database = connection.database
+
+            if not migrations.pending:
+                row = database.execute(
+                    f'SELECT version FROM {RECORD_SCHEMAS_TABLE} WHERE table_name = ?', (cls.table_name,)
+                ).fetchone()
+                version = SchemaMigrations.BASE_VERSION if row is None else row[0]
+
+                if version < migrations.latest:
+                    rows = database.execute(
+                        f'SELECT doc_id FROM {cls.table_name} '
+                        f"WHERE coalesce(json_extract(document, '$.{migrations.attribute}'), ?) < ? LIMIT ?",
+                        (SchemaMigrations.BASE_VERSION, migrations.latest, limit),
+                    )
+                    migrations.pending.update(doc_id for doc_id, in rows)
+
+                if not migrations.pending:
+                    if version < migrations.latest:
+                        database.execute(
+                            f'INSERT OR REPLACE INTO {RECORD_SCHEMAS_TABLE} (table_name, version) VALUES (?, ?)',
+                            (cls.table_name, migrations.latest),
+                        )
+                    migrations.complete = True
+                    return 0
+
+            batch = sorted(migrations.pending)[:limit]
+            migrations.pending.difference_update(batch)
+            rows = database.execute(
+                f'SELECT doc_id, document FROM {cls.table_name} WHERE doc_id IN (SELECT value FROM json_each(?))',
+                (json.dumps(batch),),
+            ).fetchall()
+
+            saved = 0
+            for doc_id, document in rows:
+                values = json.loads(document)
+                if migrations.upgrade(values):
+                    cls.write_document(database, doc_id, values)
+                    saved += 1
+
+            return saved
+
+    @classmethod
+    def order_by_activities(cls) -> Dict[str, List[Any]]:
+        """
+        Order registers by activities.
+
+        :return: A dictionary with activities as keys and lists of registers as values. The 'geral' key holds every
+            register and the activities follow in alphabetical order. Registers are listed newest first.
+        """
+        registers = cls.select_many()
+        by_id = {getattr(register, cls.id_attribute): register for register in registers}
+        result = {'geral': registers}
+
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT activity, doc_id FROM {cls.table_name}_activities ORDER BY activity, doc_id DESC'
+            )
+            for activity, doc_id in rows:
+                result.setdefault(activity, []).append(by_id[doc_id])
+
+        return result
+
+    @classmethod
+    def get_activities(cls) -> Set[str]:
+        """
+        Get unique activities.
+
+        :return: A set containing unique activities.
+        """
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(f'SELECT DISTINCT activity FROM {cls.table_name}_activities')
+            return {activity for activity, in rows}
+
+    @classmethod
+    def count_by_activities(cls) -> Dict[str, int]:
+        """
+        Count the registers enrolled in each activity.
+
+        :return: A dictionary with activities as keys and the number of registers as values.
+        """
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT activity, COUNT(*) FROM {cls.table_name}_activities GROUP BY activity'
+            )
+            return dict(rows.fetchall())
+
+    @classmethod
+    def select_by_birthdate_range(cls, start: date, end: date) -> List[Any]:
+        """
+        Retrieve the records born between two dates, both inclusive.
+
+        :param start: The first birthdate of the range.
+        :param end: The last birthdate of the range.
+
+        :return: A list of records, newest first.
+        """
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT doc_id, document FROM {cls.table_name} WHERE birthdate BETWEEN ? AND ? ORDER BY doc_id DESC',
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+            return cls.to_records(rows)
+
+    @classmethod
+    def select_by_age_range(cls, min_age: int, max_age: int) -> List[Any]:
+        """
+        Retrieve the records whose age is between two ages, both inclusive.
+
+        :param min_age: The minimum age.
+        :param max_age: The maximum age.
+
+        :return: A list of records, newest first.
+        """
+        today = date.today()
+        start = date(today.year - max_age - 1, 1, 1)
+        end = date(today.year - min_age, 12, 31)
+
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT doc_id, birthdate, document FROM {cls.table_name} WHERE birthdate BETWEEN ? AND ? '
+                'ORDER BY doc_id DESC',
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+
+            return [
+                cls.record_class(cls.load_document(doc_id, document), doc_id)
+                for doc_id, birthdate, document in rows
+                if min_age <= formats.format_date_to_age(date.fromisoformat(birthdate), today) <= max_age
+            ]
+
+    @classmethod
+    def select_without_birthdate(cls) -> List[Any]:
+        """
+        Retrieve the records whose birthdate is empty or could not be parsed.
+
+        :return: A list of records, newest first.
+        """
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT doc_id, document FROM {cls.table_name} WHERE birthdate IS NULL ORDER BY doc_id DESC'
+            ).fetchall()
+            return cls.to_records(rows)
+
+    @classmethod
+    def find_by_document(cls, number: str, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Find the records holding a document number (CPF, RG), ignoring punctuation and case.
+
+        :param number: The document number.
+        :param fields: The entity attributes to return instead of records, see `BaseRepository.select_many`.
+
+        :return: A list of records holding the document number, newest first.
+        """
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT {cls.columns(fields)} FROM {cls.table_name} WHERE doc_id IN '
+                f'(SELECT doc_id FROM {cls.table_name}_documents WHERE number = ?) ORDER BY doc_id DESC',
+                (formats.format_document_number(number),),
+            ).fetchall()
+            return cls.to_results(rows, fields)
+
+    @classmethod
+    def search_full_text(cls, searched: str, fields: Optional[Sequence[str]] = None) -> Optional[List[Any]]:
+        """
+        Search the records with the FTS5 full-text index.
+
+        Every word of the query must start a word of the name, document numbers, school, address or contacts,
+        ignoring case and accents. Matches in the name rank first, then matches in the document numbers. Records with
+        the same rank are listed newest first.
+
+        :param searched: The search query.
+        :param fields: The entity attributes to return instead of records, see `BaseRepository.select_many`.
+
+        :return: A list of records by rank, or None if the query has no word to search.
+        """
+        query = full_text_query(searched)
+
+        if query is None:
+            return None
+
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT {cls.columns(fields, "record")} FROM {cls.table_name}_fts '
+                f'JOIN {cls.table_name} record ON record.doc_id = {cls.table_name}_fts.rowid '
+                f'WHERE {cls.table_name}_fts MATCH ? '
+                f'ORDER BY bm25({cls.table_name}_fts, 10.0, 5.0, 1.0), record.doc_id DESC',
+                (query,),
+            ).fetchall()
+            return cls.to_results(rows, fields)
+
+    @classmethod
+    def search_many(cls, searched: str, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Search for multiple records based on a search query.
+
+        When the query looks like a complete document number and some record holds it, the document numbers table
+        answers. With `constants.SQLITE_FULL_TEXT_SEARCH` the query goes to `search_full_text`. Otherwise, or when the
+        query has no word, a record matches when any of the search attributes contains the query, ignoring case and
+        accents. Unlike `BaseRepository.search_many`, the query is never used as a regular expression.
+
+        :param searched: The search query used to find matching records.
+        :param fields: The entity attributes to return instead of records, see `BaseRepository.select_many`.
+
+        :return: A list of records matching the search query, or of tuples with the projected attributes.
+        """
+        if formats.is_document_number(searched):
+            registers = cls.find_by_document(searched, fields)
+            if registers:
+                return registers
+
+        if not searched:
+            return cls.select_many(fields)
+
+        if constants.SQLITE_FULL_TEXT_SEARCH:
+            registers = cls.search_full_text(searched, fields)
+            if registers is not None:
+                return registers
+
+        pattern = like_pattern(searched)
+
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f"SELECT {cls.columns(fields)} FROM {cls.table_name} WHERE search_key LIKE ? ESCAPE '\\' "
+                'ORDER BY doc_id DESC',
+                (pattern,),
+            ).fetchall()
+            return cls.to_results(rows, fields)
+
+    @classmethod
+    def search_among(cls, searched: str, doc_ids: Iterable[int], fields: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Search for a search query among some records, like `search_page` does among all of them.
+
+        :param searched: The search query used to find matching records.
+        :param doc_ids: The IDs of the records to search among. IDs of missing records are ignored.
+        :param fields: The entity attributes to return instead of records, see `BaseRepository.select_many`.
+
+        :return: A list of records matching the search query, newest first, or of tuples with the projected
+            attributes.
+        """
+        doc_ids = list(set(doc_ids))
+
+        if not doc_ids:
+            return []
+
+        condition, parameters = cls.search_condition(searched)
+        # The IDs are passed as a single JSON array, so a bulk change does not hit the SQL variables limit.
+        where = 'doc_id IN (SELECT value FROM json_each(?))' + (f' AND {condition}' if condition else '')
+
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT {cls.columns(fields)} FROM {cls.table_name} WHERE {where} ORDER BY doc_id DESC',
+                (json.dumps(doc_ids), *parameters),
+            ).fetchall()
+            return cls.to_results(rows, fields)
+
+    @classmethod
+    def search_condition(cls, searched: str) -> Tuple[str, Tuple[Any, ...]]:
+        """
+        Build the SQL condition on the records table matching a search query, as in `search_many`.
+
+        :param searched: The search query.
+
+        :return: The condition and its parameters. The condition is an empty string when every record matches.
+        """
+        if formats.is_document_number(searched):
+            parameters = (formats.format_document_number(searched),)
+
+            with SqliteConnection() as connection:
+                found = connection.database.execute(
+                    f'SELECT 1 FROM {cls.table_name}_documents WHERE number = ?', parameters
+                ).fetchone()
+
+            if found is not None:
+                return f'doc_id IN (SELECT doc_id FROM {cls.table_name}_documents WHERE number = ?)', parameters
+
+        if not searched:
+            return '', ()
+
+        query = full_text_query(searched) if constants.SQLITE_FULL_TEXT_SEARCH else None
+
+        if query is not None:
+            return f'doc_id IN (SELECT rowid FROM {cls.table_name}_fts WHERE {cls.table_name}_fts MATCH ?)', (query,)
+
+        return "search_key LIKE ? ESCAPE '\\'", (like_pattern(searched),)
+
+    @classmethod
+    def select_page_rows(
+        cls,
+        condition: str,
+        parameters: Tuple[Any, ...],
+        after_id: Optional[int],
+        limit: int,
+        newest_first: bool,
+    ) -> List[Any]:
+        """
+        Retrieve a page of the records meeting a SQL condition, ordered by ID.
+
+        :param condition: A SQL condition on the records table, or an empty string for every record.
+        :param parameters: The parameters of the condition.
+        :param after_id: The ID of the last record of the previous page, or None for the first page.
+        :param limit: The maximum number of records in the page.
+        :param newest_first: Whether the records go from the newest to the oldest.
+
+        :return: A list of records.
+        """
+        conditions = [condition] if condition else []
+
+        if after_id is not None:
+            conditions.append('doc_id < ?' if newest_first else 'doc_id > ?')
+            parameters += (after_id,)
+
+        where = f'WHERE {" AND ".join(conditions)} ' if conditions else ''
+        order = 'DESC' if newest_first else 'ASC'
+
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT doc_id, document FROM {cls.table_name} {where}ORDER BY doc_id {order} LIMIT ?',
+                parameters + (limit,),
+            ).fetchall()
+            return cls.to_records(rows)
+
+    @classmethod
+    def select_page(cls, after_id: Optional[int] = None, limit: int = 100, newest_first: bool = True) -> List[Any]:
+        """
+        Retrieve a page of records ordered by ID.
+
+        Pass the ID of the last record of a page as `after_id` to get the next page. The page is read through the
+        primary key, so its cost does not depend on the table size.
+
+        :param after_id: The ID of the last record of the previous page, or None for the first page.
+        :param limit: The maximum number of records in the page.
+        :param newest_first: Whether the records go from the newest to the oldest.
+
+        :return: A list of records, empty after the last page.
+        """
+        return cls.select_page_rows('', (), after_id, limit, newest_first)
+
+    @classmethod
+    def search_page(
+        cls,
+        searched: str,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        newest_first: bool = True,
+    ) -> List[Any]:
+        """
+        Retrieve a page of the records matching a search query, ordered by ID.
+
+        The query is handled as in `search_many` and the pages as in `select_page`. Full-text matches are paged by ID,
+        not by rank.
+
+        :param searched: The search query used to find matching records.
+        :param after_id: The ID of the last record of the previous page, or None for the first page.
+        :param limit: The maximum number of records in the page.
+        :param newest_first: Whether the records go from the newest to the oldest.
+
+        :return: A list of records, empty after the last page.
+        """
+        return cls.select_page_rows(*cls.search_condition(searched), after_id, limit, newest_first)
+
+    @classmethod
+    def iter_rows(cls, condition: str, parameters: Tuple[Any, ...], raw: bool) -> Iterator[Any]:
+        """
+        Iterate over the records meeting a SQL condition, in ID order, reading them from a cursor as they are consumed.
+
+        :param condition: A SQL condition on the records table, or an empty string for every record.
+        :param parameters: The parameters of the condition.
+        :param raw: Whether to yield the stored documents instead of records.
+
+        :return: An iterator over records, or over TinyDB-like documents with their `doc_id`.
+        """
+        where = f'WHERE {condition} ' if condition else ''
+
+        with SqliteConnection() as connection:
+            rows = connection.database.execute(
+                f'SELECT doc_id, document FROM {cls.table_name} {where}ORDER BY doc_id', parameters
+            )
+
+            for doc_id, document in rows:
+                document = cls.load_document(doc_id, document)
+                yield Document(document, doc_id) if raw else cls.record_class(document, doc_id)
+
+    @classmethod
+    def iter_all(cls, raw: bool = False) -> Iterator[Any]:
+        """
+        Iterate over every record, oldest first, without building a list of them.
+
+        :param raw: Whether to yield the stored documents instead of records.
+
+        :return: An iterator over records, or over TinyDB-like documents with their `doc_id`.
+        """
+        return cls.iter_rows('', (), raw)
+
+    @classmethod
+    def iter_search(cls, searched: str, raw: bool = False) -> Iterator[Any]:
+        """
+        Iterate over the records matching a search query, as in `search_many`, oldest first.
+
+        :param searched: The search query used to find matching records.
+        :param raw: Whether to yield the stored documents instead of records.
+
+        :return: An iterator over records, or over TinyDB-like documents with their `doc_id`.
+        """
+        return cls.iter_rows(*cls.search_condition(searched), raw)
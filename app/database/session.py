@@ -0,0 +1,119 @@
+import json
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Type, Union
+
+from app import constants
+from app.database.connections import LocalConnection, SqliteConnection
+from app.database.connections.sqlite_connection import TABLES
+from app.database.converters import convert_json_to_sqlite
+from app.database.repositories import AdultRepository, ChildRepository
+from app.database.storages.database_files import check_database_files
+
+
+def get_connection_class() -> Type[Union[LocalConnection, SqliteConnection]]:
+    """
+    Get the connection class of the configured storage backend (`constants.DATABASE_BACKEND`).
+
+    :return: SqliteConnection for the 'sqlite' backend, LocalConnection otherwise.
+    """
+    if constants.DATABASE_BACKEND == 'sqlite':
+        return SqliteConnection
+    return LocalConnection
+
+
+def open_session() -> None:
+    """
+    Open the process-wide database session of the configured backend.
+
+    With the 'sqlite' backend, the first session copies `database.json` into the SQLite database, keeping the doc_ids.
+    It fails if there is no `database.json` but the database is kept in another storage format, which must be
+    converted to `database.json` first.
+
+    :return: None
+    """
+    if constants.DATABASE_BACKEND == 'sqlite' and not constants.SQLITE_DATABASE_PATH.exists():
+        check_database_files(constants.DATABASE_PATH, 'sqlite', ('json', 'sqlite'))
+        if constants.DATABASE_PATH.exists():
+            convert_json_to_sqlite(constants.DATABASE_PATH, constants.SQLITE_DATABASE_PATH)
+
+    get_connection_class().open_session()
+
+
+def close_session() -> None:
+    """
+    Close the process-wide database session of the configured backend.
+
+    :return: None
+    """
+    get_connection_class().close_session()
+
+
+def flush() -> None:
+    """
+    Force the pending writes of the session to disk.
+
+    :return: None
+    """
+    get_connection_class().flush()
+
+
+def flush_if_due() -> None:
+    """
+    Flush the pending writes of the session if the durability policy asks for it.
+
+    :return: None
+    """
+    get_connection_class().flush_if_due()
+
+
+def save_upgrades() -> None:
+    """
+    Save a batch of the records upgraded to the latest record schema, for each table, once the user stopped saving.
+
+    Nothing is saved until no record was saved for `constants.DATABASE_FLUSH_IDLE_SECONDS`, so the batches do not
+    compete with the user for the database lock. With the 'tinydb' backend the batches of every table are written
+    together, in a single write of the database. Once every table is at the latest record schema, the database is not
+    opened at all.
+
+    :return: None
+    """
+    repositories = (ChildRepository, AdultRepository)
+    if all(repository.migrations.complete and not repository.migrations.pending for repository in repositories):
+        return
+
+    now = time.monotonic()
+
+    for repository in repositories:
+        last_write_at = repository.feed.last_published_at
+        if last_write_at is not None and now - last_write_at < constants.DATABASE_FLUSH_IDLE_SECONDS:
+            return
+
+    batch = nullcontext() if constants.DATABASE_BACKEND == 'sqlite' else LocalConnection(write=True, batch=True)
+    with batch:
+        for repository in repositories:
+            repository.save_upgrades(constants.SCHEMA_UPGRADE_BATCH_SIZE)
+
+
+def dump_database() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Read every record of the configured backend, in the TinyDB JSON layout.
+
+    :return: A dictionary with table names as keys and dictionaries of documents by doc_id (as strings) as values.
+    """
+    if constants.DATABASE_BACKEND == 'sqlite':
+        tables = {}
+
+        with SqliteConnection() as connection:
+            for table in TABLES:
+                rows = connection.database.execute(f'SELECT doc_id, document FROM {table} ORDER BY doc_id')
+                tables[table] = {str(doc_id): json.loads(document) for doc_id, document in rows}
+
+        return tables
+
+    with LocalConnection() as connection:
+        database = connection.database
+        return {
+            name: {str(document.doc_id): dict(document) for document in database.table(name).all()}
+            for name in sorted(database.tables())
+        }
@@ -0,0 +1,8 @@
+from .database_files import check_database_files, get_database_files  # isort:skip
+from .log_storage import LogStorage  # isort:skip
+from .change_recorder import ChangeRecorder  # isort:skip
+from .log_table import LogTable  # isort:skip
+from .table_files_storage import TableFilesStorage  # isort:skip
+from .fast_json_storage import FastJSONStorage  # isort:skip
+from .message_pack_storage import MessagePackStorage  # isort:skip
+from .compressed_storage import CompressedStorage  # isort:skip
@@ -0,0 +1,86 @@
+from typing import Any, Callable, Dict, Iterator, MutableMapping
+
+# Marks a document that did not exist before the operation.
+MISSING = object()
+
+
+class ChangeRecorder(MutableMapping):
+    """
+    View of the raw content of a table, keyed by document ID, that records the documents a TinyDB operation reads,
+    replaces or removes.
+
+    TinyDB keeps the documents under string keys and its operations use document IDs. The view converts each key on
+    access, so an operation costs the documents it touches instead of converting the whole table both ways. TinyDB
+    changes the documents in place after reading them with `table[doc_id]`, so a read document counts as changed.
+    """
+
+    def __init__(self, documents: Dict[str, Any], document_id_class: Callable[[str], Any] = int) -> None:
+        """
+        Initialize the ChangeRecorder.
+
+        :param documents: The raw table content, changed in place.
+        :param document_id_class: The document ID class of the table.
+        """
+        self.documents = documents
+        self.document_id_class = document_id_class
+        self.originals: Dict[str, Any] = {}
+
+    def __getitem__(self, doc_id: Any) -> Any:
+        key = self.record(doc_id)
+        return self.documents[key]
+
+    def __setitem__(self, doc_id: Any, document: Any) -> None:
+        key = self.record(doc_id)
+        self.documents[key] = document
+
+    def __delitem__(self, doc_id: Any) -> None:
+        key = self.record(doc_id)
+        del self.documents[key]
+
+    def __contains__(self, doc_id: Any) -> bool:
+        return str(doc_id) in self.documents
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self.document_id_class(key) for key in self.documents)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def clear(self) -> None:
+        for key in self.documents:
+            self.originals.setdefault(key, self.documents[key])
+        self.documents.clear()
+
+    def record(self, doc_id: Any) -> str:
+        """
+        Record a document as changed, remembering the document it had before the operation.
+
+        :param doc_id: The document ID.
+
+        :return: The raw key of the document.
+        """
+        key = str(doc_id)
+        self.originals.setdefault(key, self.documents.get(key, MISSING))
+        return key
+
+    def changed(self) -> Iterator[str]:
+        """
+        Get the raw keys of the documents the operation read, replaced or removed.
+
+        :return: The raw keys.
+        """
+        return iter(self.originals)
+
+    def rollback(self) -> None:
+        """
+        Put back the documents the operation replaced, inserted or removed.
+
+        Like TinyDB, the changes made in place to a document that is still in the table are not undone.
+
+        :return: None
+        """
+        for key, document in self.originals.items():
+            if document is MISSING:
+                self.documents.pop(key, None)
+            else:
+                self.documents[key] = document
@@ -0,0 +1,70 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from tinydb import Storage
+
+from app.database.storages.database_files import check_database_files
+from app.utils.compression import CODEC_EXTENSIONS, open_compressed
+
+
+class CompressedStorage(Storage):
+    """
+    Storage keeping the database as compressed JSON.
+
+    The file lives next to `database.json` as `database.json.gz` (gzip, stdlib) or `database.json.zst` (zstd, needs the
+    zstandard package). The JSON is streamed through the compressor while it is encoded, so saving does not build the
+    whole serialized database in memory. The new file is written next to the old one and renamed when complete.
+
+    The first time it is opened, an existing `database.json` is compressed into it and kept as `database.json.bak`.
+    """
+
+    def __init__(self, path: str, codec: str = 'gzip', **kwargs) -> None:
+        """
+        Initialize the CompressedStorage.
+
+        :param path: The JSON database path, the compressed file adds the codec extension to it.
+        :param codec: 'gzip' or 'zstd'.
+        """
+        super().__init__()
+        json_path = Path(path)
+        self.codec = codec
+        self.path = json_path.with_name(json_path.name + CODEC_EXTENSIONS[codec])
+        check_database_files(json_path, codec, (codec, 'json'))
+
+        if not self.path.exists() and json_path.exists():
+            with open(json_path, encoding='utf-8') as file:
+                content = file.read()
+            self.write(json.loads(content) if content.strip() else {})
+            os.replace(json_path, json_path.with_name(json_path.name + '.bak'))
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Decompress and parse the database file.
+
+        :return: The database content, or None if there is no database yet.
+        """
+        if not self.path.exists():
+            return None
+
+        with open_compressed(self.path, 'rt', self.codec) as file:
+            return json.load(file)
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Encode and compress the database into a new file, then replace the old one.
+
+        :param data: The database content.
+
+        :return: None
+        """
+        temporary_path = self.path.with_name(self.path.name + '.tmp')
+
+        with open_compressed(temporary_path, 'wt', self.codec) as file:
+            json.dump(data, file, separators=(',', ':'), ensure_ascii=False)
+
+        with open(temporary_path, mode='ab') as file:
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, self.path)
@@ -0,0 +1,52 @@
+from pathlib import Path
+from typing import Dict, Iterable
+
+from app.database.errors import StorageFormatError
+from app.utils.compression import CODEC_EXTENSIONS
+
+
+def get_database_files(path: Path) -> Dict[str, Path]:
+    """
+    Get the files, or directory, each storage format keeps the database in.
+
+    :param path: The JSON database path, `database.json`.
+
+    :return: A dict of format name to path.
+    """
+    return {
+        'json': path,
+        'log': path.with_name(path.name + '.log'),
+        'backup': path.with_name(path.name + '.bak'),
+        'tables': path.with_suffix(''),
+        'msgpack': path.with_suffix('.msgpack'),
+        'gzip': path.with_name(path.name + CODEC_EXTENSIONS['gzip']),
+        'zstd': path.with_name(path.name + CODEC_EXTENSIONS['zstd']),
+        'sqlite': path.with_suffix('.sqlite3'),
+    }
+
+
+def check_database_files(path: Path, storage: str, formats: Iterable[str]) -> None:
+    """
+    Make sure a storage that finds none of its files does not start an empty database over one in another format.
+
+    It runs whenever a database is opened, in every format. A storage that finds neither its own files nor a
+    `database.json` to migrate fails when the database is kept in another format, typically after the storage is
+    switched back from one that migrated `database.json` and kept it as `database.json.bak`.
+
+    :param path: The JSON database path, `database.json`.
+    :param storage: The storage format, for the error message.
+    :param formats: The formats the storage reads, see `get_database_files`.
+
+    :return: None
+
+    :raises StorageFormatError: If the storage has no file but another format has.
+    """
+    files = get_database_files(Path(path))
+    formats = set(formats)
+
+    if any(files[name].exists() for name in formats):
+        return
+
+    others = [file for name, file in files.items() if name not in formats and file.exists()]
+    if others:
+        raise StorageFormatError(storage, others)
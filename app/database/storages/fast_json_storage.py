@@ -0,0 +1,110 @@
+import json
+import os
+from typing import Any, Dict, Optional
+
+from tinydb import Storage
+from tinydb.storages import touch
+
+from app.database.storages.database_files import check_database_files
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional.
+    orjson = None
+
+
+class FastJSONStorage(Storage):
+    """
+    JSON storage tuned for speed.
+
+    It reads and writes the same format as `JSONStorage`, using orjson when it is installed and falling back to
+    compact stdlib json otherwise. Pretty-printing is off by default; a human readable copy of the database can be
+    exported with `export_database_to_json`.
+    """
+
+    def __init__(self, path: str, pretty: bool = False, **kwargs) -> None:
+        """
+        Initialize the FastJSONStorage.
+
+        :param path: The database file.
+        :param pretty: Write the file indented, for humans, at the cost of speed and size.
+        """
+        super().__init__()
+        self.pretty = pretty
+        check_database_files(path, 'fast', ('json',))
+        touch(path, create_dirs=False)
+        self.handle = open(path, mode='rb+')
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Parse the database file.
+
+        :return: The database content, or None if the file is empty.
+        """
+        return self.deserialize(self.read_bytes())
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Serialize the database and replace the file content.
+
+        :param data: The database content.
+
+        :return: None
+        """
+        self.write_bytes(self.serialize(data))
+
+    def read_bytes(self) -> bytes:
+        """
+        Read the database file.
+
+        :return: The file content.
+        """
+        self.handle.seek(0)
+        return self.handle.read()
+
+    def deserialize(self, content: bytes) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Parse the database file content.
+
+        :param content: The file content.
+
+        :return: The database content, or None if the file is empty.
+        """
+        if not content.strip():
+            return None
+
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+
+    def serialize(self, data: Dict[str, Dict[str, Any]]) -> bytes:
+        """
+        Serialize the database.
+
+        :param data: The database content.
+
+        :return: The file content.
+        """
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if self.pretty else 0)
+        if self.pretty:
+            return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def write_bytes(self, serialized: bytes) -> None:
+        """
+        Replace the database file content.
+
+        :param serialized: The file content.
+
+        :return: None
+        """
+        self.handle.seek(0)
+        self.handle.write(serialized)
+        self.handle.truncate()
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+
+    def close(self) -> None:
+        """Close the database file."""
+        self.handle.close()
@@ -0,0 +1,376 @@
+import json
+import logging
+import os
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO
+
+from tinydb import Storage
+
+from app.database.locks import FileLock
+from app.database.storages.database_files import check_database_files
+
+logger = logging.getLogger(__name__)
+
+
+class LogStorage(Storage):
+    """
+    Append-only, log-structured storage.
+
+    The database is a snapshot file, in the same format as `JSONStorage`, plus a journal file next to it
+    (`database.json.log`) with one JSON line per changed document. A write appends only the documents that changed
+    since the last write, so the file access depends on the size of the change and not on the size of the database.
+
+    The storage interface only hands over the whole database, so the storage must be told what changed: the tables
+    must be `LogTable` instances, which report the documents each operation touched with `track`, and only those are
+    serialized and compared with their persisted JSON text. With plain TinyDB tables, every write serializes and
+    compares the whole database, and TinyDB converts the whole table twice.
+
+    When read, the journals are replayed over the snapshot. When the journal grows past `compaction_ratio` times the
+    snapshot size, the journal is rotated to `database.json.log.compacting` and a background thread writes the new
+    snapshot to `database.json.compacted`. The next write, or closing the storage, replaces the snapshot with it and
+    drops the rotated journal; under `LockingMiddleware` both run under the exclusive database lock, so another
+    process never reads a snapshot without the journal it includes, or the other way round.
+
+    A running compaction holds its own lock, `database.json.log.compacting.lock` (see `FileLock`), so other processes
+    replay its rotated journal and leave it alone. A rotated journal whose lock is free was left by a crashed process
+    or a failed compaction: the storage opening it, or the next compaction, writes the snapshot it misses, then drops
+    it, and keeps the live journal.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compaction_ratio: float = 1.0,
+        compaction_min_bytes: int = 64 * 1024,
+        encoding: str = 'utf-8',
+        use_fcntl: bool = True,
+        stale_seconds: float = 120.0,
+        **kwargs,
+    ) -> None:
+        """
+        Initialize the LogStorage.
+
+        :param path: The snapshot file.
+        :param compaction_ratio: Journal to snapshot size ratio that starts a compaction.
+        :param compaction_min_bytes: Journal size under which no compaction is started.
+        :param encoding: The files encoding.
+        :param use_fcntl: Whether the compaction lock uses fcntl when it is available, like the database lock.
+        :param stale_seconds: The age after which a compaction lock file is considered abandoned.
+        :param kwargs: Arguments for `json.dumps` when writing the snapshot, like `indent`.
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + '.log')
+        self.compacting_path = self.path.with_name(self.path.name + '.log.compacting')
+        self.compacted_path = self.path.with_name(self.path.name + '.compacted')
+        self.compaction_ratio = compaction_ratio
+        self.compaction_min_bytes = compaction_min_bytes
+        self.encoding = encoding
+        self.kwargs = kwargs
+        self.compaction_lock = FileLock(self.compacting_path, use_fcntl, timeout=0.0, stale_seconds=stale_seconds)
+        self.compaction_hold: Optional[ExitStack] = None
+        self.compaction: Optional[threading.Thread] = None
+        self.compacted = False
+        self.changes: Optional[Dict[str, Set[str]]] = None
+        self.persisted: Optional[Dict[str, Dict[str, str]]] = None
+        self.journal: Optional[TextIO] = None
+        self.journal_size = 0
+
+        check_database_files(self.path, 'log', ('json', 'log'))
+        if self.compacting_path.exists():
+            self.recover_compaction()
+        self.snapshot_size = self.path.stat().st_size if self.path.exists() else 0
+
+    def load_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the snapshot file.
+
+        :return: The snapshot content.
+        """
+        if not self.path.exists():
+            return {}
+
+        with open(self.path, encoding=self.encoding) as file:
+            content = file.read()
+        return json.loads(content) if content.strip() else {}
+
+    def recover_compaction(self) -> None:
+        """
+        Finish the compaction of a crashed process, unless the compaction is still running.
+
+        The new snapshot is the current one with the rotated journal replayed over it, the live journal is kept.
+
+        :return: None
+        """
+        hold = self.hold_compaction_lock()
+        if hold is None:
+            return
+
+        with hold:
+            self.merge_rotated_journal()
+
+    def merge_rotated_journal(self) -> None:
+        """
+        Replay the rotated journal over the snapshot file and drop it, under the compaction lock.
+
+        A failure is logged and the rotated journal is kept, reads keep replaying it and the next compaction retries.
+
+        :return: None
+        """
+        try:
+            tables = self.load_snapshot()
+            self.replay(tables, self.compacting_path)
+            self.write_snapshot(tables)
+            self.compacting_path.unlink(missing_ok=True)
+        except Exception:
+            logger.exception('Failed to merge the rotated journal %s', self.compacting_path)
+
+    def hold_compaction_lock(self) -> Optional[ExitStack]:
+        """
+        Take the compaction lock, without waiting for it.
+
+        :return: The held lock, closing it releases the lock, or None if another compaction holds it.
+        """
+        hold = ExitStack()
+        try:
+            hold.enter_context(self.compaction_lock.exclusive('compaction'))
+        except TimeoutError:
+            return None
+        return hold
+
+    def replay(self, tables: Dict[str, Dict[str, Any]], journal_path: Path) -> None:
+        """
+        Apply the entries of a journal file.
+
+        A torn last line, left by a crash in the middle of a write, is ignored.
+
+        :param tables: The database content to update.
+        :param journal_path: The journal file.
+
+        :return: None
+        """
+        with open(journal_path, encoding=self.encoding) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+                if entry['op'] == 'put':
+                    tables.setdefault(entry['table'], {})[entry['id']] = entry['doc']
+                elif entry['op'] == 'delete':
+                    tables.get(entry['table'], {}).pop(entry['id'], None)
+                elif entry['op'] == 'drop':
+                    tables.pop(entry['table'], None)
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Read the snapshot and replay the journals over it.
+
+        The files are read here and not when the storage is opened, so the content matches the stamp `LockingMiddleware`
+        reads with it. The journal is opened again too, another process may have rotated it.
+
+        :return: The database content, TinyDB is free to change it.
+        """
+        tables = self.load_snapshot()
+        for journal_path in (self.compacting_path, self.journal_path):
+            if journal_path.exists():
+                self.replay(tables, journal_path)
+
+        self.persisted = {
+            table: {doc_id: json.dumps(document) for doc_id, document in documents.items()}
+            for table, documents in tables.items()
+        }
+        self.changes = None
+
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = open(self.journal_path, mode='a', encoding=self.encoding)
+        self.journal_size = self.journal.tell()
+        self.snapshot_size = self.path.stat().st_size if self.path.exists() else 0
+
+        return tables
+
+    def track(self, table: str, doc_ids: Iterable[str]) -> None:
+        """
+        Record the documents changed by a table operation, for the next write.
+
+        :param table: The table name.
+        :param doc_ids: The IDs of the documents the operation read, replaced or removed.
+
+        :return: None
+        """
+        if self.changes is None:
+            self.changes = {}
+        self.changes.setdefault(table, set()).update(doc_ids)
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Append the documents that changed since the last write to the journal.
+
+        Only the documents reported with `track` are compared, or all of them when nothing was reported.
+
+        :param data: The new database content.
+
+        :return: None
+        """
+        self.finish_compaction()
+        if self.persisted is None:
+            self.read()
+
+        changes, self.changes = self.changes, None
+        lines: List[str] = []
+
+        for table in self.persisted.keys() - data.keys():
+            lines.append(json.dumps({'op': 'drop', 'table': table}))
+            del self.persisted[table]
+
+        for table, documents in data.items():
+            persisted = self.persisted.setdefault(table, {})
+            doc_ids = persisted.keys() | documents.keys() if changes is None else changes.get(table, ())
+
+            for doc_id in doc_ids:
+                if doc_id in documents:
+                    text = json.dumps(documents[doc_id])
+                    if persisted.get(doc_id) != text:
+                        lines.append(json.dumps({'op': 'put', 'table': table, 'id': doc_id, 'doc': documents[doc_id]}))
+                        persisted[doc_id] = text
+
+                elif persisted.pop(doc_id, None) is not None:
+                    lines.append(json.dumps({'op': 'delete', 'table': table, 'id': doc_id}))
+
+        if not lines:
+            return
+
+        content = ''.join(line + '\n' for line in lines)
+        self.journal.write(content)
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.journal_size += len(content)
+
+        if self.journal_size > self.compaction_ratio * max(self.snapshot_size, self.compaction_min_bytes):
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Start a background compaction, unless one is already running in any process.
+
+        The journal is rotated first, so new writes keep going to a fresh journal while the snapshot is written. A
+        rotated journal left by a crashed process or a failed compaction is merged into the snapshot first.
+
+        :return: None
+        """
+        if self.compaction is not None:
+            return
+
+        if self.compacting_path.exists():
+            self.recover_compaction()
+            if self.compacting_path.exists():
+                return
+
+        self.compaction_hold = self.hold_compaction_lock()
+        if self.compaction_hold is None:
+            return
+
+        self.journal.close()
+        os.replace(self.journal_path, self.compacting_path)
+        self.journal = open(self.journal_path, mode='a', encoding=self.encoding)
+        self.journal_size = 0
+
+        # The persisted documents are JSON texts, which are immutable, so a shallow copy is a stable view.
+        texts = {table: dict(documents) for table, documents in self.persisted.items()}
+        self.compaction = threading.Thread(target=self.prepare_snapshot, args=(texts,))
+        self.compaction.start()
+
+    def prepare_snapshot(self, texts: Dict[str, Dict[str, str]]) -> None:
+        """
+        Write the new snapshot next to the current one, in the compaction thread.
+
+        A failure is logged, `finish_compaction` then merges the rotated journal itself.
+
+        :param texts: The JSON texts of the documents at the rotation.
+
+        :return: None
+        """
+        try:
+            tables = {
+                table: {doc_id: json.loads(text) for doc_id, text in documents.items()}
+                for table, documents in texts.items()
+            }
+            self.write_file(self.compacted_path, json.dumps(tables, **self.kwargs))
+            self.compacted = True
+        except Exception:
+            logger.exception('Failed to write the compacted snapshot %s', self.compacted_path)
+            self.compacted_path.unlink(missing_ok=True)
+
+    def finish_compaction(self, wait: bool = False) -> None:
+        """
+        Replace the snapshot with the one written by the compaction thread and drop the rotated journal it includes.
+
+        When the compaction thread failed, the rotated journal is merged into the current snapshot instead. It runs in
+        the thread using the storage, under the database lock when there is one.
+
+        :param wait: Whether to wait for a running compaction thread, instead of leaving it for a later call.
+
+        :return: None
+        """
+        if self.compaction is None or (self.compaction.is_alive() and not wait):
+            return
+
+        self.compaction.join()
+
+        try:
+            if self.compacted:
+                os.replace(self.compacted_path, self.path)
+                self.snapshot_size = self.path.stat().st_size
+                self.compacting_path.unlink(missing_ok=True)
+            else:
+                self.merge_rotated_journal()
+
+        finally:
+            self.compaction = None
+            self.compacted = False
+            self.compaction_hold.close()
+            self.compaction_hold = None
+
+    def write_snapshot(self, tables: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Atomically replace the snapshot file.
+
+        :param tables: The database content.
+
+        :return: None
+        """
+        serialized = json.dumps(tables, **self.kwargs)
+        temporary_path = self.path.with_name(self.path.name + '.tmp')
+        self.write_file(temporary_path, serialized)
+        os.replace(temporary_path, self.path)
+        self.snapshot_size = len(serialized)
+
+    def write_file(self, path: Path, content: str) -> None:
+        """
+        Write a file and wait for it to reach the disk.
+
+        :param path: The file.
+        :param content: The file content.
+
+        :return: None
+        """
+        with open(path, mode='w', encoding=self.encoding) as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def close(self) -> None:
+        """
+        Wait for a running compaction, finish it and close the journal.
+
+        :return: None
+        """
+        try:
+            self.finish_compaction(wait=True)
+        finally:
+            if self.journal is not None:
+                self.journal.close()
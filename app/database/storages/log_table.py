@@ -0,0 +1,53 @@
+from typing import Callable, Dict, Mapping, Optional
+
+from tinydb.table import Table
+
+from app.database.storages.change_recorder import ChangeRecorder
+from app.database.storages.log_storage import LogStorage
+
+
+class LogTable(Table):
+    """
+    Table that tells the `LogStorage` below it which documents each write changed.
+
+    Without it `LogStorage.write` compares every document with the persisted one to find the changes.
+    """
+
+    def _update_table(self, updater: Callable[[Dict[int, Mapping]], None]) -> None:
+        """
+        Perform a table update operation, as `Table._update_table` does, recording the documents it changed.
+
+        The operation changes the raw table content in place, through a `ChangeRecorder`, instead of a converted copy.
+
+        :param updater: The function changing the table content.
+
+        :return: None
+        """
+        storage = self.log_storage()
+        if storage is None:
+            super()._update_table(updater)
+            return
+
+        tables = self._storage.read() or {}
+        table = ChangeRecorder(tables.setdefault(self.name, {}), self.document_id_class)
+
+        try:
+            updater(table)
+        except BaseException:
+            table.rollback()
+            raise
+
+        storage.track(self.name, table.changed())
+        self._storage.write(tables)
+        self.clear_cache()
+
+    def log_storage(self) -> Optional[LogStorage]:
+        """
+        Find the LogStorage under the middlewares of the table storage.
+
+        :return: The LogStorage, or None if the table is stored in another storage.
+        """
+        storage = self._storage
+        while storage is not None and not isinstance(storage, LogStorage):
+            storage = getattr(storage, 'storage', None)
+        return storage
@@ -0,0 +1,117 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from tinydb import Storage
+
+from app.database.storages.database_files import check_database_files
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional.
+    msgpack = None
+
+
+class MessagePackStorage(Storage):
+    """
+    Storage keeping the database MessagePack-encoded.
+
+    The binary encoding is smaller and faster to parse than JSON for our string-heavy records. The file lives next to
+    `database.json` with the `.msgpack` extension. The first time it is opened, an existing `database.json` is
+    converted into it and kept as `database.json.bak`; see `app.database.converters` to convert in both directions.
+
+    It needs the optional msgpack package.
+    """
+
+    def __init__(self, path: str, **kwargs) -> None:
+        """
+        Initialize the MessagePackStorage.
+
+        :param path: The JSON database path, the MessagePack file uses the same name with the `.msgpack` extension.
+        """
+        super().__init__()
+
+        if msgpack is None:
+            raise ImportError('The MessagePack storage needs the msgpack package: pip install msgpack')
+
+        json_path = Path(path)
+        self.path = json_path.with_suffix('.msgpack')
+        check_database_files(json_path, 'msgpack', ('msgpack', 'json'))
+
+        if not self.path.exists() and json_path.exists():
+            with open(json_path, encoding='utf-8') as file:
+                content = file.read()
+            self.path.write_bytes(msgpack.packb(json.loads(content) if content.strip() else {}, use_bin_type=True))
+            os.replace(json_path, json_path.with_name(json_path.name + '.bak'))
+
+        self.path.touch()
+        self.handle = open(self.path, mode='rb+')
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Decode the database file.
+
+        :return: The database content, or None if the file is empty.
+        """
+        return self.deserialize(self.read_bytes())
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Encode the database and replace the file content.
+
+        :param data: The database content.
+
+        :return: None
+        """
+        self.write_bytes(self.serialize(data))
+
+    def read_bytes(self) -> bytes:
+        """
+        Read the database file.
+
+        :return: The file content.
+        """
+        self.handle.seek(0)
+        return self.handle.read()
+
+    def deserialize(self, content: bytes) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Decode the database file content.
+
+        :param content: The file content.
+
+        :return: The database content, or None if the file is empty.
+        """
+        if not content:
+            return None
+
+        return msgpack.unpackb(content, raw=False)
+
+    def serialize(self, data: Dict[str, Dict[str, Any]]) -> bytes:
+        """
+        Encode the database.
+
+        :param data: The database content.
+
+        :return: The file content.
+        """
+        return msgpack.packb(data, use_bin_type=True)
+
+    def write_bytes(self, serialized: bytes) -> None:
+        """
+        Replace the database file content.
+
+        :param serialized: The file content.
+
+        :return: None
+        """
+        self.handle.seek(0)
+        self.handle.write(serialized)
+        self.handle.truncate()
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+
+    def close(self) -> None:
+        """Close the database file."""
+        self.handle.close()
@@ -0,0 +1,202 @@
+import json
+import os
+import shutil
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set
+
+from tinydb import Storage
+
+from app.database.storages.database_files import check_database_files
+
+
+class LazyTables(MutableMapping):
+    """
+    Mapping of table name to table content that reads each table file only when the table is first used.
+
+    Assigned and deleted tables are remembered, so only those are written back.
+    """
+
+    def __init__(self, storage: 'TableFilesStorage') -> None:
+        self.storage = storage
+        self.names: Set[str] = storage.table_names()
+        self.loaded: Dict[str, Dict[str, Any]] = {}
+        self.changed: Set[str] = set()
+        self.dropped: Set[str] = set()
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        if name not in self.names:
+            raise KeyError(name)
+        if name not in self.loaded:
+            self.loaded[name] = self.storage.read_table(name)
+        return self.loaded[name]
+
+    def __setitem__(self, name: str, table: Dict[str, Any]) -> None:
+        self.names.add(name)
+        self.loaded[name] = table
+        self.changed.add(name)
+        self.dropped.discard(name)
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self.names:
+            raise KeyError(name)
+        self.names.discard(name)
+        self.loaded.pop(name, None)
+        self.changed.discard(name)
+        self.dropped.add(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self.names))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class TableFilesStorage(Storage):
+    """
+    Storage keeping each table in its own JSON file.
+
+    The tables of `database.json` live in a `database` directory next to it, as `adults.json`, `children.json` and so
+    on. A table file is parsed only when the table is used and written only when the table changes, so the cost of
+    using a table does not depend on the size of the others.
+
+    An existing single-file database is split into table files the first time it is opened, and kept as
+    `database.json.bak`.
+    """
+
+    def __init__(self, path: str, encoding: str = 'utf-8', **kwargs) -> None:
+        """
+        Initialize the TableFilesStorage.
+
+        :param path: The single-file database path, the table files go to a directory with the same name without
+            extension.
+        :param encoding: The files encoding.
+        :param kwargs: Arguments for `json.dumps` when writing a table, like `indent`.
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.directory = self.path.with_suffix('')
+        self.backup_path = self.path.with_name(self.path.name + '.bak')
+        self.encoding = encoding
+        self.kwargs = kwargs
+
+        if not self.directory.exists():
+            check_database_files(self.path, 'tables', ('tables', 'json'))
+            self.migrate()
+        elif self.path.exists() and not self.backup_path.exists():
+            # A crash after the split, before the single-file database was kept as a backup.
+            os.replace(self.path, self.backup_path)
+
+    def migrate(self) -> None:
+        """
+        Split the single-file database, if there is one, into table files.
+
+        The table files are written to a temporary directory that takes the place of the table directory once
+        complete, so a crash leaves no table directory, and the split runs again on the next opening.
+
+        :return: None
+        """
+        temporary_directory = self.directory.with_name(self.directory.name + '.tmp')
+        shutil.rmtree(temporary_directory, ignore_errors=True)
+        temporary_directory.mkdir(parents=True)
+
+        if self.path.exists():
+            with open(self.path, encoding=self.encoding) as file:
+                content = file.read()
+
+            if content.strip():
+                for name, table in json.loads(content).items():
+                    self.write_file(temporary_directory / f'{name}.json', table)
+
+        os.replace(temporary_directory, self.directory)
+        if self.path.exists():
+            os.replace(self.path, self.backup_path)
+
+    def table_path(self, name: str) -> Path:
+        """
+        Get the file of a table.
+
+        :param name: The table name.
+
+        :return: The table file path.
+        """
+        return self.directory / f'{name}.json'
+
+    def table_names(self) -> Set[str]:
+        """
+        List the tables that have a file.
+
+        :return: A set of table names.
+        """
+        return {path.stem for path in self.directory.glob('*.json')}
+
+    def read_table(self, name: str) -> Dict[str, Any]:
+        """
+        Parse a table file.
+
+        :param name: The table name.
+
+        :return: The table content.
+        """
+        with open(self.table_path(name), encoding=self.encoding) as file:
+            content = file.read()
+        return json.loads(content) if content.strip() else {}
+
+    def write_table(self, name: str, table: Dict[str, Any]) -> None:
+        """
+        Atomically replace a table file.
+
+        :param name: The table name.
+        :param table: The table content.
+
+        :return: None
+        """
+        self.write_file(self.table_path(name), table)
+
+    def write_file(self, path: Path, table: Dict[str, Any]) -> None:
+        """
+        Atomically replace a table file, given its path.
+
+        :param path: The table file path.
+        :param table: The table content.
+
+        :return: None
+        """
+        temporary_path = path.with_name(path.name + '.tmp')
+
+        with open(temporary_path, mode='w', encoding=self.encoding) as file:
+            file.write(json.dumps(table, **self.kwargs))
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, path)
+
+    def read(self) -> Optional[LazyTables]:
+        """
+        Read the database.
+
+        :return: A mapping that parses each table file on first access.
+        """
+        return LazyTables(self)
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write the tables that changed since they were read.
+
+        :param data: The database content, usually the mapping returned by `read`.
+
+        :return: None
+        """
+        if isinstance(data, LazyTables):
+            for name in data.changed:
+                self.write_table(name, data.loaded[name])
+            for name in data.dropped:
+                self.table_path(name).unlink(missing_ok=True)
+            data.changed.clear()
+            data.dropped.clear()
+            return
+
+        for name in self.table_names() - data.keys():
+            self.table_path(name).unlink()
+        for name, table in data.items():
+            self.write_table(name, table)
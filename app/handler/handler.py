@@ -1,13 +1,22 @@
 import traceback
+from datetime import datetime
 from functools import partial
+from typing import List
 
 from app import constants
+from app.database import session
+from app.database.events import ChangeEvent
 from app.database.repositories import AdultRepository, ChildRepository
 from app.ui import Application
 from app.ui.forms import AdultsForm, ChildrenForm, DocumentForm
+from app.utils.backup import export_database_to_backup, export_database_to_json
 from app.utils.excel import export_adults_to_excel, export_children_to_excel
 from app.utils.pdf import generate_adult_entity_pdf, generate_child_entity_pdf
 
+# Record attributes shown by the children and adults tables, in the columns order.
+CHILDREN_TABLE_FIELDS = ('child_id', 'child_name', 'child_cpf', 'child_rg')
+ADULTS_TABLE_FIELDS = ('adult_id', 'adult_name', 'adult_cpf', 'adult_rg')
+
 
 class Handler:
     """
@@ -22,11 +31,15 @@ class Handler:
         :param application: An instance of the Application class.
         """
         self.application = application
+        self.children_searched = ''
+        self.adults_searched = ''
         self.bind_menubar()
         self.bind_navbar()
         self.bind_toolbar()
         self.bind_children_page()
         self.bind_adults_page()
+        ChildRepository.feed.subscribe(self.handle_children_changes)
+        AdultRepository.feed.subscribe(self.handle_adults_changes)
 
     def bind_menubar(self) -> None:
         """
@@ -40,6 +53,8 @@ class Handler:
         help_menu.add_command(label='Sobre', command=self.handle_about)
         file_menu.add_command(label='Exportar crianças', command=self.handle_export_children)
         file_menu.add_command(label='Exportar adultos', command=self.handle_export_adults)
+        file_menu.add_command(label='Exportar JSON', command=self.handle_export_json)
+        file_menu.add_command(label='Backup compactado', command=self.handle_backup)
 
         file_menu.add_separator()
         file_menu.add_command(label='Sair', command=self.handle_exit)
@@ -201,6 +216,28 @@ class Handler:
         command = partial(self.handle_confirm_export_adults, form)
         form.confirm_button.config(command=command)
 
+    def bind_export_json_form(self, form: DocumentForm) -> None:
+        """
+        Bind the JSON export action to the provided document form.
+
+        :param form: A DocumentForm to which the JSON export action is bound.
+
+        :return: None
+        """
+        command = partial(self.handle_confirm_export_json, form)
+        form.confirm_button.config(command=command)
+
+    def bind_backup_form(self, form: DocumentForm) -> None:
+        """
+        Bind the backup action to the provided document form.
+
+        :param form: A DocumentForm to which the backup action is bound.
+
+        :return: None
+        """
+        command = partial(self.handle_confirm_backup, form)
+        form.confirm_button.config(command=command)
+
     def handle_about(self) -> None:
         self.application.open_info_dialog('Sobre', 'Função em desenvolvimento')
 
@@ -232,6 +269,34 @@ class Handler:
         form = self.application.open_document_form(initialfile, initialdir, filetypes)
         self.bind_export_adults_form(form)
 
+    def handle_export_json(self) -> None:
+        """
+        Handle the JSON export action.
+
+        This method opens a document form for exporting the whole database to a human readable JSON file.
+
+        :return: None
+        """
+        initialfile = 'prossan.json'
+        initialdir = constants.HOME_DIR
+        filetypes = (('Arquivo JSON', '*.json'),)
+        form = self.application.open_document_form(initialfile, initialdir, filetypes)
+        self.bind_export_json_form(form)
+
+    def handle_backup(self) -> None:
+        """
+        Handle the backup action.
+
+        This method opens a document form for saving a compressed backup of the whole database.
+
+        :return: None
+        """
+        initialfile = datetime.now().strftime('prossan-%Y%m%d-%H%M%S.json.gz')
+        initialdir = constants.HOME_DIR
+        filetypes = (('Backup gzip', '*.gz'), ('Backup zstd', '*.zst'))
+        form = self.application.open_document_form(initialfile, initialdir, filetypes)
+        self.bind_backup_form(form)
+
     def handle_confirm_export_children(self, form: DocumentForm) -> None:
         """
         Handle the export of child registers to an Excel file.
@@ -241,9 +306,9 @@ class Handler:
         :return: None
         """
         try:
-            values = ChildRepository.order_by_activities()
+            registers = ChildRepository.iter_all(raw=True)
             file_path = form.get_value()
-            export_children_to_excel(values, file_path)
+            export_children_to_excel(registers, file_path)
 
         except Exception as error:
             print(traceback.format_exc())
@@ -264,9 +329,53 @@ class Handler:
         :return: None
         """
         try:
-            values = AdultRepository.order_by_activities()
+            registers = AdultRepository.iter_all(raw=True)
+            file_path = form.get_value()
+            export_adults_to_excel(registers, file_path)
+
+        except Exception as error:
+            print(traceback.format_exc())
+            self.application.open_danger_dialog('Atenção', str(error))
+
+        else:
+            form.destroy()
+            title = 'Informação'
+            message = 'Operação realizada com sucesso.'
+            self.application.open_info_dialog(title, message)
+
+    def handle_confirm_export_json(self, form: DocumentForm) -> None:
+        """
+        Handle the export of the whole database to an indented JSON file.
+
+        :param form: The `DocumentForm` containing the export file path.
+
+        :return: None
+        """
+        try:
+            file_path = form.get_value()
+            export_database_to_json(file_path)
+
+        except Exception as error:
+            print(traceback.format_exc())
+            self.application.open_danger_dialog('Atenção', str(error))
+
+        else:
+            form.destroy()
+            title = 'Informação'
+            message = 'Operação realizada com sucesso.'
+            self.application.open_info_dialog(title, message)
+
+    def handle_confirm_backup(self, form: DocumentForm) -> None:
+        """
+        Handle the export of the whole database to a compressed backup file.
+
+        :param form: The `DocumentForm` containing the backup file path.
+
+        :return: None
+        """
+        try:
             file_path = form.get_value()
-            export_adults_to_excel(values, file_path)
+            export_database_to_backup(file_path)
 
         except Exception as error:
             print(traceback.format_exc())
@@ -425,7 +534,7 @@ class Handler:
             title = 'Informação'
             message = 'Operação realizada com sucesso.'
             self.application.open_info_dialog(title, message)
-            self.refresh_children_page()
+            self.application.focus_search_children_entry()
             form.destroy()
 
     def handle_confirm_update_children(self, form: ChildrenForm) -> None:
@@ -442,7 +551,8 @@ class Handler:
         try:
             values = form.get_values()
             child_id = form.child_entity.child_id
-            ChildRepository.update_one(child_id, values)
+            child_version = form.child_entity.child_version
+            ChildRepository.update_one(child_id, values, expected_version=child_version)
 
         except Exception as error:
             self.application.open_danger_dialog('Atenção', str(error))
@@ -452,7 +562,7 @@ class Handler:
             title = 'informação'
             message = 'operação realizada com sucesso.'
             self.application.open_info_dialog(title, message)
-            self.refresh_children_page()
+            self.application.focus_search_children_entry()
             form.destroy()
 
     def handle_confirm_delete_children(self) -> None:
@@ -469,6 +579,7 @@ class Handler:
             if selection is not None:
                 child_id = int(selection[0])
                 ChildRepository.delete_one(child_id)
+                session.flush()
 
         except Exception as error:
             self.application.open_danger_dialog('Atenção', str(error))
@@ -478,7 +589,7 @@ class Handler:
             title = 'Informação'
             message = 'Operação realizada com sucesso.'
             self.application.open_info_dialog(title, message)
-            self.refresh_children_page()
+            self.application.focus_search_children_entry()
 
     def handle_children_pdf(self) -> None:
         """
@@ -604,7 +715,7 @@ class Handler:
             title = 'Informação'
             message = 'Operação realizada com sucesso.'
             self.application.open_info_dialog(title, message)
-            self.refresh_adults_page()
+            self.application.focus_search_adults_entry()
             form.destroy()
 
     def handle_confirm_update_adults(self, form: AdultsForm) -> None:
@@ -621,7 +732,8 @@ class Handler:
         try:
             values = form.get_values()
             adult_id = form.adult_entity.adult_id
-            AdultRepository.update_one(adult_id, values)
+            adult_version = form.adult_entity.adult_version
+            AdultRepository.update_one(adult_id, values, expected_version=adult_version)
 
         except Exception as error:
             self.application.open_danger_dialog('Atenção', str(error))
@@ -631,7 +743,7 @@ class Handler:
             title = 'Informação'
             message = 'Operação realizada com sucesso.'
             self.application.open_info_dialog(title, message)
-            self.refresh_adults_page()
+            self.application.focus_search_adults_entry()
             form.destroy()
 
     def handle_confirm_delete_adults(self) -> None:
@@ -648,6 +760,7 @@ class Handler:
             if selection is not None:
                 adult_id = int(selection[0])
                 AdultRepository.delete_one(adult_id)
+                session.flush()
 
         except Exception as error:
             self.application.open_danger_dialog('Atenção', str(error))
@@ -657,7 +770,7 @@ class Handler:
             title = 'Informação'
             message = 'Operação realizada com sucesso.'
             self.application.open_info_dialog(title, message)
-            self.refresh_adults_page()
+            self.application.focus_search_adults_entry()
 
     def handle_adults_pdf(self) -> None:
         """
@@ -726,7 +839,8 @@ class Handler:
         """
         try:
             searched = self.application.get_searched_children()
-            children = ChildRepository.search_many(searched)
+            children = ChildRepository.search_many(searched, fields=CHILDREN_TABLE_FIELDS)
+            self.children_searched = searched
 
         except Exception as error:
             self.application.open_danger_dialog('Atenção', str(error))
@@ -744,7 +858,8 @@ class Handler:
         """
         try:
             searched = self.application.get_searched_adults()
-            adults = AdultRepository.search_many(searched)
+            adults = AdultRepository.search_many(searched, fields=ADULTS_TABLE_FIELDS)
+            self.adults_searched = searched
 
         except Exception as error:
             self.application.open_danger_dialog('Atenção', str(error))
@@ -753,3 +868,51 @@ class Handler:
         else:
             self.application.focus_search_adults_entry()
             self.application.set_adults(adults)
+
+    def handle_children_changes(self, events: List[ChangeEvent]) -> None:
+        """
+        Patch the children table with the changes published by the children repository.
+
+        Deleted records lose their row. Inserted and updated records get their row added or replaced when they match
+        the search shown in the table, and removed otherwise, without searching every record again.
+
+        :param events: The change events of a write operation.
+
+        :return: None
+        """
+        try:
+            changed = [event.doc_id for event in events if event.kind != ChangeEvent.DELETED]
+            children = ChildRepository.search_among(self.children_searched, changed, fields=CHILDREN_TABLE_FIELDS)
+            matched = {row[0] for row in children}
+
+        except Exception as error:
+            self.application.open_danger_dialog('Atenção', str(error))
+            print(traceback.format_exc())
+
+        else:
+            self.application.remove_children([event.doc_id for event in events if event.doc_id not in matched])
+            self.application.put_children(children)
+
+    def handle_adults_changes(self, events: List[ChangeEvent]) -> None:
+        """
+        Patch the adults table with the changes published by the adults repository.
+
+        Deleted records lose their row. Inserted and updated records get their row added or replaced when they match
+        the search shown in the table, and removed otherwise, without searching every record again.
+
+        :param events: The change events of a write operation.
+
+        :return: None
+        """
+        try:
+            changed = [event.doc_id for event in events if event.kind != ChangeEvent.DELETED]
+            adults = AdultRepository.search_among(self.adults_searched, changed, fields=ADULTS_TABLE_FIELDS)
+            matched = {row[0] for row in adults}
+
+        except Exception as error:
+            self.application.open_danger_dialog('Atenção', str(error))
+            print(traceback.format_exc())
+
+        else:
+            self.application.remove_adults([event.doc_id for event in events if event.doc_id not in matched])
+            self.application.put_adults(adults)
@@ -1,3 +1,4 @@
+import logging
 import tkinter as tk
 from datetime import datetime
 from typing import Callable, List, Optional, Tuple
@@ -5,6 +6,7 @@ from typing import Callable, List, Optional, Tuple
 import ttkbootstrap as ttk
 
 from app import constants
+from app.database import session
 from app.database.entities import AdultEntity, ChildEntity
 from app.ui.components import Footer, Menubar, NavBar, Toolbar
 from app.ui.dialogs import ConfirmCancelDialog, DangerDialog, InfoDialog
@@ -12,6 +14,8 @@ from app.ui.forms import AdultsForm, ChildrenForm, DocumentForm
 from app.ui.pages import AdultsPage, ChildrenPage, HomePage
 from app.utils.images import image_tk
 
+logger = logging.getLogger(__name__)
+
 
 class Application(ttk.Window):
     """
@@ -72,6 +76,7 @@ class Application(ttk.Window):
         self.title('Escritório do Prossan')
         self.iconphoto(True, self.logo_img)
         self.update_date_time()
+        self.flush_database_job: Optional[str] = None
         self.go_to_home_page()
         self.apply_style()
 
@@ -172,6 +177,28 @@ class Application(ttk.Window):
         """Stop Application.update_date_time callback."""
         self.after_cancel(self.update_date_time)
 
+    def flush_database(self) -> None:
+        """
+        Save a batch of the records upgraded to the latest record schema and flush the buffered database writes when
+        they are due.
+
+        The check runs every second while the application is running. The upgrades are only saved once the user
+        stopped saving records, see `session.save_upgrades`. An error, like a lock timeout, is logged and the check
+        runs again on the next second.
+        """
+        self.flush_database_job = self.after(1000, self.flush_database)
+        try:
+            session.save_upgrades()
+            session.flush_if_due()
+        except Exception:
+            logger.exception('Failed to save the database in the background')
+
+    def stop_flush_database(self) -> None:
+        """Stop Application.flush_database callback."""
+        if self.flush_database_job is not None:
+            self.after_cancel(self.flush_database_job)
+            self.flush_database_job = None
+
     def open_confirm_cancel_dialog(self, title: str, message: str, command: Callable) -> None:
         """
         Open a confirmation and cancellation dialog box.
@@ -346,45 +373,88 @@ class Application(ttk.Window):
         """
         return self.adults_page.search_entry.get().strip()
 
-    def set_children(self, children: List[ChildEntity]) -> None:
+    def set_children(self, children: List[Tuple[int, str, str, str]]) -> None:
         """
-        Set values in the children table with data from a list of ChildEntity objects.
+        Set values in the children table with rows projected by the children repository.
 
-        :param children: A list of ChildEntity objects to display in the table.
+        :param children: A list of (ID, name, CPF, RG) rows to display in the table.
         """
         table = self.children_page.table
         table.clear_rows()
 
-        for child in children:
-            row = (child.child_id, child.child_name, child.child_cpf, child.child_rg)
+        for row in children:
             table.insert_row(row)
 
-    def set_adults(self, adults: List[AdultEntity]) -> None:
+    def set_adults(self, adults: List[Tuple[int, str, str, str]]) -> None:
         """
-        Set values in the adults table with data from a list of AdultEntity objects.
+        Set values in the adults table with rows projected by the adults repository.
 
-        :param adults: A list of AdultEntity objects to display in the table.
+        :param adults: A list of (ID, name, CPF, RG) rows to display in the table.
         """
         table = self.adults_page.table
         table.clear_rows()
 
-        for adult in adults:
-            row = (adult.adult_id, adult.adult_name, adult.adult_cpf, adult.adult_rg)
+        for row in adults:
             table.insert_row(row)
 
+    def put_children(self, children: List[Tuple[int, str, str, str]]) -> None:
+        """
+        Add or replace some rows of the children table, keeping the others.
+
+        :param children: A list of (ID, name, CPF, RG) rows projected by the children repository.
+        """
+        for row in children:
+            self.children_page.table.put_row(row)
+
+    def remove_children(self, child_ids: List[int]) -> None:
+        """
+        Remove some rows of the children table.
+
+        :param child_ids: The IDs of the rows to remove. IDs not in the table are ignored.
+        """
+        for child_id in child_ids:
+            self.children_page.table.delete_row(child_id)
+
+    def put_adults(self, adults: List[Tuple[int, str, str, str]]) -> None:
+        """
+        Add or replace some rows of the adults table, keeping the others.
+
+        :param adults: A list of (ID, name, CPF, RG) rows projected by the adults repository.
+        """
+        for row in adults:
+            self.adults_page.table.put_row(row)
+
+    def remove_adults(self, adult_ids: List[int]) -> None:
+        """
+        Remove some rows of the adults table.
+
+        :param adult_ids: The IDs of the rows to remove. IDs not in the table are ignored.
+        """
+        for adult_id in adult_ids:
+            self.adults_page.table.delete_row(adult_id)
+
     def start(self) -> None:
         """
         Start the application main loop, displaying the graphical user interface.
 
-        This method initializes the application window, centers it on the screen, and enters the main event loop.
+        This method opens the database session, initializes the application window, centers it on the screen, and
+        enters the main event loop.
 
         :return: None
         """
+        session.open_session()
+        self.flush_database()
         self.geometry('1000x550')
         self.place_window_center()
         self.mainloop()
 
     def stop(self) -> None:
-        """Stop the application."""
+        """Stop the application and close the database session, the window is closed even if closing it fails."""
         self.stop_date_time_update()
-        self.destroy()
+        self.stop_flush_database()
+        try:
+            session.close_session()
+        except Exception:
+            logger.exception('Failed to save the database when closing the application')
+        finally:
+            self.destroy()
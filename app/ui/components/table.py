@@ -1,5 +1,5 @@
 import tkinter as tk
-from typing import List, Optional, Tuple, Union
+from typing import Any, List, Optional, Tuple, Union
 
 import ttkbootstrap as ttk
 
@@ -43,13 +43,45 @@ class Table(ttk.Frame):
         """
         Insert a row of data into the table.
 
-        This method inserts a new row with the provided data into the table.
+        This method inserts a new row with the provided data at the end of the table. The first value of the row is
+        its ID, used by `put_row` and `delete_row` to find it.
 
         :param row: The data to insert as a row.
 
         :return: None
         """
-        self.treeview.insert('', tk.END, values=row)
+        self.treeview.insert('', tk.END, iid=str(row[0]), values=row)
+
+    def put_row(self, row: Tuple[Any, ...]) -> None:
+        """
+        Replace the values of a row, or insert it if the table does not have it.
+
+        The rows are listed by decreasing ID, so a new row is inserted before the first row with a lower ID.
+
+        :param row: The data of the row, starting with its integer ID.
+
+        :return: None
+        """
+        row_id = str(row[0])
+
+        if self.treeview.exists(row_id):
+            self.treeview.item(row_id, values=row)
+            return
+
+        items = self.treeview.get_children()
+        index = next((index for index, item in enumerate(items) if int(item) < row[0]), len(items))
+        self.treeview.insert('', index, iid=row_id, values=row)
+
+    def delete_row(self, row_id: int) -> None:
+        """
+        Delete a row from the table, if the table has it.
+
+        :param row_id: The ID of the row.
+
+        :return: None
+        """
+        if self.treeview.exists(str(row_id)):
+            self.treeview.delete(str(row_id))
 
     def get_selection(self) -> Optional[Tuple[str, ...]]:
         """
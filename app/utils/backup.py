@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+from app.database.session import dump_database
+from app.utils.compression import get_codec, open_compressed
+
+
+def export_database_to_json(file_path: str) -> None:
+    """
+    Export the whole database to an indented, human readable JSON file.
+
+    The file has the same layout as `database.json`, so it can also be used to restore the database.
+
+    :param file_path: The file path to save the JSON document.
+
+    :return: None
+    """
+    with open(file_path, mode='w', encoding='utf-8') as file:
+        json.dump(dump_database(), file, indent=2, ensure_ascii=False)
+
+
+def export_database_to_backup(file_path: str) -> None:
+    """
+    Export the whole database to a compressed JSON backup file.
+
+    The codec comes from the file extension: `.gz` for gzip or `.zst` for zstd. The JSON is streamed through the
+    compressor, so the serialized database is never held in memory. Once decompressed, the file has the same layout as
+    `database.json`.
+
+    :param file_path: The file path to save the backup, ending with `.gz` or `.zst`.
+
+    :return: None
+    """
+    path = Path(file_path)
+
+    with open_compressed(path, 'wt', get_codec(path)) as file:
+        json.dump(dump_database(), file, separators=(',', ':'), ensure_ascii=False)
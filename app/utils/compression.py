@@ -0,0 +1,54 @@
+import gzip
+import io
+from pathlib import Path
+from typing import IO
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional.
+    zstandard = None
+
+CODEC_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def get_codec(path: Path) -> str:
+    """
+    Get the compression codec of a file from its extension.
+
+    :param path: The file path, ending with `.gz` or `.zst`.
+
+    :return: 'gzip' or 'zstd'.
+    """
+    for codec, extension in CODEC_EXTENSIONS.items():
+        if path.name.endswith(extension):
+            return codec
+    raise ValueError(f'Unknown compressed file extension: {path.name}')
+
+
+def open_compressed(path: Path, mode: str, codec: str) -> IO[str]:
+    """
+    Open a compressed text file for streaming reads or writes.
+
+    Data is compressed or decompressed chunk by chunk, so the whole uncompressed content is never held in memory.
+
+    :param path: The file path.
+    :param mode: 'rt' to read or 'wt' to write.
+    :param codec: 'gzip' (stdlib) or 'zstd' (needs the zstandard package).
+
+    :return: A text file object, to be used as a context manager.
+    """
+    if codec == 'gzip':
+        return gzip.open(path, mode, compresslevel=6, encoding='utf-8')
+
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ImportError('The zstd compression needs the zstandard package: pip install zstandard')
+
+        if mode == 'rt':
+            reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+            return io.TextIOWrapper(reader, encoding='utf-8')
+
+        writer = zstandard.ZstdCompressor(level=3).stream_writer(open(path, 'wb'), closefd=True)
+        return io.TextIOWrapper(writer, encoding='utf-8')
+
+    raise ValueError(f'Unknown compression codec: {codec}')
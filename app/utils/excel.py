@@ -1,52 +1,76 @@
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
 
 import pandas as pd
 
-from app.database.entities import AdultEntity, ChildEntity
 from app.utils.formats import format_str_to_age, format_str_to_date
 
+COLUMNS = ('Nome', 'Gênero', 'Nascimento', 'Idade', 'CPF', 'RG')
 
-def export_children_to_excel(values: Dict[str, List[ChildEntity]], file_path: str) -> None:
+
+def group_rows_by_activities(registers: Iterable[Mapping[str, Any]], prefix: str) -> Dict[str, List[Tuple[Any, ...]]]:
+    """
+    Build the spreadsheet rows of the registers, grouped by activity, in a single pass.
+
+    Only the exported columns are kept, so the registers can be streamed from the repository.
+
+    :param registers: The stored documents, oldest first.
+    :param prefix: The attributes prefix, 'child' or 'adult'.
+
+    :return: A dictionary with activities as keys and lists of rows as values. The 'geral' key holds every register
+        and the activities follow in alphabetical order. Rows are listed newest first.
+    """
+    sheets: Dict[str, List[Tuple[Any, ...]]] = {'geral': []}
+
+    for register in registers:
+        birthdate = register[f'{prefix}_birthdate']
+        row = (
+            register[f'{prefix}_name'],
+            register[f'{prefix}_gender'],
+            format_str_to_date(birthdate),
+            format_str_to_age(birthdate),
+            register[f'{prefix}_cpf'],
+            register[f'{prefix}_rg'],
+        )
+        sheets['geral'].append(row)
+
+        for activity in set(register[f'{prefix}_activities']):
+            sheets.setdefault(activity, []).append(row)
+
+    general = sheets.pop('geral')
+    result = {'geral': general[::-1]}
+    result.update((activity, sheets[activity][::-1]) for activity in sorted(sheets))
+    return result
+
+
+def export_children_to_excel(registers: Iterable[Mapping[str, Any]], file_path: str) -> None:
     """
     Export child registers to an Excel file.
 
-    :param values: A dictionary where keys represent activities and values are lists of ChildEntity objects.
+    The file has a 'geral' sheet with every register and a sheet for each activity.
+
+    :param registers: The stored child documents, as yielded by `ChildRepository.iter_all(raw=True)`.
     :param file_path: The file path to save the Excel document.
 
     :return: None
     """
     with pd.ExcelWriter(file_path) as writer:
-        for activity, registers in values.items():
-            data = {
-                'Nome': [register.child_name for register in registers],
-                'Gênero': [register.child_gender for register in registers],
-                'Nascimento': [format_str_to_date(register.child_birthdate) for register in registers],
-                'Idade': [format_str_to_age(register.child_birthdate) for register in registers],
-                'CPF': [register.child_cpf for register in registers],
-                'RG': [register.child_rg for register in registers],
-            }
-            data_frame = pd.DataFrame(data)
+        for activity, rows in group_rows_by_activities(registers, 'child').items():
+            data_frame = pd.DataFrame(rows, columns=COLUMNS)
             data_frame.to_excel(writer, sheet_name=activity, index=False)
 
 
-def export_adults_to_excel(values: Dict[str, List[AdultEntity]], file_path: str) -> None:
+def export_adults_to_excel(registers: Iterable[Mapping[str, Any]], file_path: str) -> None:
     """
     Export adult registers to an Excel file.
 
-    :param values: A dictionary where keys represent activities and values are lists of AdultEntity objects.
+    The file has a 'geral' sheet with every register and a sheet for each activity.
+
+    :param registers: The stored adult documents, as yielded by `AdultRepository.iter_all(raw=True)`.
     :param file_path: The file path to save the Excel document.
 
     :return: None
     """
     with pd.ExcelWriter(file_path) as writer:
-        for activity, registers in values.items():
-            data = {
-                'Nome': [register.adult_name for register in registers],
-                'Gênero': [register.adult_gender for register in registers],
-                'Nascimento': [format_str_to_date(register.adult_birthdate) for register in registers],
-                'Idade': [format_str_to_age(register.adult_birthdate) for register in registers],
-                'CPF': [register.adult_cpf for register in registers],
-                'RG': [register.adult_rg for register in registers],
-            }
-            data_frame = pd.DataFrame(data)
+        for activity, rows in group_rows_by_activities(registers, 'adult').items():
+            data_frame = pd.DataFrame(rows, columns=COLUMNS)
             data_frame.to_excel(writer, sheet_name=activity, index=False)
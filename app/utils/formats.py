@@ -1,5 +1,7 @@
+import re
+import unicodedata
 from datetime import date, datetime
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 
 def format_housing(housing: Tuple[str, str]) -> str:
@@ -62,12 +64,67 @@ def format_str_to_age(born: str) -> Union[str, int]:
 
     :return: A datetime object if the string can be converted, or the original string.
     """
-    today = date.today()
     formatted_born = format_str_to_date(born)
 
     if isinstance(formatted_born, date):
-        return (
-            today.year - formatted_born.year - ((today.month, today.day) < (formatted_born.month, formatted_born.day))
-        )
+        return format_date_to_age(formatted_born)
 
     return born
+
+
+def format_date_to_age(born: date, today: Optional[date] = None) -> int:
+    """
+    Calculate the age of someone born on a date.
+
+    :param born: The birthdate.
+    :param today: The date the age is calculated on, today by default.
+
+    :return: The age in years.
+    """
+    today = today or date.today()
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def format_document_number(value: str) -> str:
+    """
+    Normalize a document number (CPF, RG) by keeping only letters and digits, in upper case.
+
+    :param value: A string representing a document number.
+
+    :return: The normalized document number.
+    """
+    return re.sub(r'[^0-9A-Za-z]', '', value).upper()
+
+
+def is_document_number(value: str) -> bool:
+    """
+    Check if a string looks like a complete document number (CPF, RG).
+
+    :param value: A string typed by the user.
+
+    :return: True if the string has only digits and separators, with at least seven digits.
+    """
+    return re.fullmatch(r'[0-9.\-/ ]+[xX]?', value) is not None and len(re.sub(r'\D', '', value)) >= 7
+
+
+def format_without_accents(value: str) -> str:
+    """
+    Remove the accents of a string, like "João" to "Joao".
+
+    :param value: A string.
+
+    :return: The string decomposed (NFKD) without its combining marks.
+    """
+    decomposed = unicodedata.normalize('NFKD', value)
+    return ''.join(character for character in decomposed if not unicodedata.combining(character))
+
+
+def format_search_key(value: str) -> str:
+    """
+    Normalize a string for accent and case insensitive search.
+
+    :param value: A string.
+
+    :return: The string without accents, in lower case.
+    """
+    return format_without_accents(value).lower()
@@ -0,0 +1,88 @@
+"""
+Benchmark the memory kept by the hydrated entities of a generated database.
+
+The entities are built from a freshly parsed JSON file, like the repositories do, and the parsed documents are dropped,
+so the result is what the entity cache keeps per record. The slotted entities are compared with plain dataclasses
+holding the same fields, a `__dict__` and an eager first name, which is how the entities used to be declared.
+
+Usage:
+    python -m benchmarks.entity_memory_benchmark [records]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Any, Dict, List, Tuple, Type
+
+from app.database.entities import AdultEntity, ChildEntity
+from benchmarks.storage_benchmark import generate_database
+
+RECORDS = 20_000
+
+
+def dict_entity_class(entity_class: Type, prefix: str) -> Type:
+    """
+    Declare a plain dataclass with the fields of an entity class, a `__dict__` and an eager first name.
+
+    :param entity_class: The slotted entity class.
+    :param prefix: The attributes prefix, 'child' or 'adult'.
+
+    :return: The dataclass.
+    """
+
+    def __post_init__(self) -> None:
+        setattr(self, f'{prefix}_first_name', getattr(self, f'{prefix}_name').split(' ')[0])
+
+    return make_dataclass(
+        f'Dict{entity_class.__name__}',
+        [(field.name, field.type) for field in fields(entity_class)],
+        namespace={'__post_init__': __post_init__},
+    )
+
+
+def measure(entity_class: Type, prefix: str, content: str) -> Tuple[int, int]:
+    """
+    Measure the memory kept by the entities built from a JSON database.
+
+    :param entity_class: The entity class.
+    :param prefix: The attributes prefix, 'child' or 'adult'.
+    :param content: The JSON database.
+
+    :return: The number of entities and the bytes they keep.
+    """
+    table = 'children' if prefix == 'child' else 'adults'
+    gc.collect()
+    tracemalloc.start()
+
+    documents: Dict[str, Dict[str, Any]] = json.loads(content)[table]
+    entities: List[Any] = []
+    for doc_id, document in documents.items():
+        entity = entity_class(**document)
+        setattr(entity, f'{prefix}_id', int(doc_id))
+        entities.append(entity)
+
+    del documents
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(entities), size
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else RECORDS
+    content = json.dumps(generate_database(records))
+    print(f'{records} records')
+    print(f'{"entity":<20}{"dict (B)":>12}{"slots (B)":>12}{"saved":>8}')
+
+    for entity_class, prefix in ((ChildEntity, 'child'), (AdultEntity, 'adult')):
+        count, before = measure(dict_entity_class(entity_class, prefix), prefix, content)
+        count, after = measure(entity_class, prefix, content)
+        saved = 1 - after / before
+        print(f'{entity_class.__name__:<20}{before / count:>12.0f}{after / count:>12.0f}{saved:>8.0%}')
+
+
+if __name__ == '__main__':
+    main()
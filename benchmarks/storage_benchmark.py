@@ -0,0 +1,141 @@
+"""
+Benchmark the load and save time of the TinyDB storages on a generated database.
+
+Usage:
+    python -m benchmarks.storage_benchmark [records]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from tinydb import JSONStorage, Storage
+
+from app.database.storages import CompressedStorage, FastJSONStorage, MessagePackStorage
+from app.database.storages.message_pack_storage import msgpack
+from app.utils.compression import zstandard
+
+RECORDS = 20_000
+
+SAMPLE_ADULT = {
+    'adult_name': 'Amaral Emanuel',
+    'adult_gender': 'Masculino',
+    'adult_birthdate': '15/05/1967',
+    'adult_cpf': '123.456.789-00',
+    'adult_rg': 'MG-12.345.678',
+    'adult_ethnicity': 'Negra',
+    'adult_religion': 'Católica',
+    'adult_marital_status': 'Viuvo(a)',
+    'adult_household_income': 'Dois salários mínimos',
+    'adult_residents': '2',
+    'adult_housing': ['Própia', '0000,00'],
+    'adult_address': ['Rua dos Patos', 'Boa Vista', 'Pouso Alegre', 'MG'],
+    'adult_contacts': ['4002-8922'],
+    'adult_activities': ['fisioterapia', 'karatê'],
+}
+
+SAMPLE_CHILD = {
+    'child_name': 'Ana Amanda',
+    'child_gender': 'Feminino',
+    'child_birthdate': '15/07/2015',
+    'child_cpf': '987.654.321-00',
+    'child_rg': 'MG-87.654.321',
+    'child_ethnicity': 'Parda',
+    'child_religion': 'Evangélica',
+    'child_clothing_number': '12',
+    'child_shoe_number': '30',
+    'child_school_name': 'Escola Estadual Santo Antônio',
+    'child_school_degree': 'Ensino fundamental',
+    'child_school_period': 'Manhã',
+    'child_activities': ['informática', 'karatê'],
+    'parent_name': 'Maria Amanda',
+    'parent_gender': 'Feminino',
+    'parent_birthdate': '01/02/1985',
+    'parent_cpf': '111.222.333-44',
+    'parent_rg': 'MG-11.222.333',
+    'parent_household_income': 'Um salário mínimo',
+    'parent_housing': ['Alugada', '500,00'],
+    'parent_authorization': 'Sim',
+    'parent_address': ['Rua dos Patos', 'Boa Vista', 'Pouso Alegre', 'MG'],
+    'parent_contacts': ['4002-8922', '3422-0000'],
+}
+
+
+def generate_database(records: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate a database with half adults and half children.
+
+    :param records: The total number of records.
+
+    :return: The database content, in the TinyDB layout.
+    """
+    adults = {str(index): dict(SAMPLE_ADULT, adult_name=f'Adulto {index}') for index in range(1, records // 2 + 1)}
+    children = {str(index): dict(SAMPLE_CHILD, child_name=f'Criança {index}') for index in range(1, records // 2 + 1)}
+    return {'adults': adults, 'children': children}
+
+
+def measure(create: Callable[[Path], Storage], path: Path, data: Dict[str, Any]) -> Tuple[float, float, int]:
+    """
+    Measure the save and load time of a storage.
+
+    :param create: A function creating the storage for a path.
+    :param path: The database file.
+    :param data: The database content.
+
+    :return: The save time, the load time (both in seconds) and the file size in bytes.
+    """
+    storage = create(path)
+    file_path = Path(getattr(storage, 'path', path))
+    start = time.perf_counter()
+    storage.write(data)
+    save_time = time.perf_counter() - start
+    storage.close()
+
+    storage = create(path)
+    start = time.perf_counter()
+    storage.read()
+    load_time = time.perf_counter() - start
+    storage.close()
+
+    return save_time, load_time, file_path.stat().st_size
+
+
+def storages() -> List[Tuple[str, Callable[[Path], Storage]]]:
+    """
+    List the benchmarked storages.
+
+    :return: A list of (name, factory) pairs.
+    """
+    result = [
+        ('JSONStorage indent=2', lambda path: JSONStorage(path, indent=2)),
+        ('FastJSONStorage', lambda path: FastJSONStorage(path)),
+        ('FastJSONStorage pretty', lambda path: FastJSONStorage(path, pretty=True)),
+    ]
+
+    if msgpack is not None:
+        result.append(('MessagePackStorage', lambda path: MessagePackStorage(path)))
+
+    result.append(('CompressedStorage gzip', lambda path: CompressedStorage(path, codec='gzip')))
+    if zstandard is not None:
+        result.append(('CompressedStorage zstd', lambda path: CompressedStorage(path, codec='zstd')))
+
+    return result
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else RECORDS
+    data = generate_database(records)
+    print(f'{records} records')
+    print(f'{"storage":<28}{"save (ms)":>12}{"load (ms)":>12}{"size (KiB)":>12}')
+
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (name, create) in enumerate(storages()):
+            path = Path(directory) / f'database{index}'
+            save_time, load_time, size = measure(create, path, data)
+            print(f'{name:<28}{save_time * 1000:>12.1f}{load_time * 1000:>12.1f}{size / 1024:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()